@@ -0,0 +1,240 @@
+"""
+Batch-job round trip of the categorization pipeline against a local stand-in for the provider's
+Files, Batches and Chat Completions endpoints, so it never touches the real API. The stand-in
+answers every request with a canned, schema-valid extraction that flags articles mentioning
+corruption; `--error-rate` makes a share of batch requests fail so they are retried live.
+
+    cd src && python -m benchmarks.batch data/bihus_news_data.json [--error-rate 0.05] [--workdir /tmp/batch]
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import count
+from json import dumps, loads
+from os import makedirs, path
+from random import Random
+from re import findall
+from threading import Lock, Thread
+from time import perf_counter, time
+from typing import Any, Callable
+
+from openai import AsyncOpenAI
+
+from core.ai.prompts import EXTRACTION_PROMPT, DataCategorizer
+from core.ai.rate_limit import LLMRateGovernor
+from core.ai.response_cache import ResponseCache
+
+ARTICLE_PATTERN: str = r'<article id="(\d+)">\n(.*?)\n</article>'
+# Requests and tokens per minute for live requests to the stand-in, which has no rate limits.
+STAND_IN_LIMIT: float = 1e9
+
+
+def canned_answer(body: dict[str, Any]) -> str:
+    """A valid combined (or packed) extraction; an article counts as corruption when it mentions it."""
+    content: str = body['messages'][-1]['content']
+
+    def extraction(text: str) -> dict[str, Any]:
+        flagged: bool = 'корупц' in text.lower()
+        return {
+            'is_corruption_present': flagged,
+            'corruption_schemes': [
+                {'type': 'Зловживання службовим становищем', 'message': text[:80]}
+            ] if flagged else [],
+            'entities': {'government_bodies': ['НАБУ'] if flagged else []},
+        }
+
+    if articles := findall(ARTICLE_PATTERN, content):
+        return dumps({'articles': [{'id': index, **extraction(text)} for index, text in articles]}, ensure_ascii=False)
+    return dumps(
+        extraction(content.removeprefix(EXTRACTION_PROMPT.head).split(EXTRACTION_PROMPT.tail)[0]), ensure_ascii=False
+    )
+
+
+class BatchStandIn:
+    """
+    Threaded HTTP server speaking the subset of the OpenAI API the batch mode uses. A batch job
+    completes after `polls` status requests; each of its requests fails with probability `error_rate`.
+    """
+
+    def __init__(
+            self,
+            answer: Callable[[dict[str, Any]], str] = canned_answer,
+            polls: int = 2,
+            error_rate: float = 0.0,
+            seed: int = 0
+    ):
+        self.answer: Callable[[dict[str, Any]], str] = answer
+        self.polls: int = polls
+        self.error_rate: float = error_rate
+        self.random: Random = Random(seed)
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.ids = count(1)
+        self.live_requests: int = 0
+        self.lock: Lock = Lock()
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.thread: Thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+
+    def completion(self, body: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'id': f'chatcmpl-{next(self.ids)}',
+            'object': 'chat.completion',
+            'created': int(time()),
+            'model': body['model'],
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': self.answer(body)},
+                'finish_reason': 'stop',
+            }],
+            'usage': None,
+        }
+
+    def store_file(self, content: bytes, purpose: str) -> dict[str, Any]:
+        file_id: str = f'file-{next(self.ids)}'
+        self.files[file_id] = content
+        return {
+            'id': file_id, 'object': 'file', 'bytes': len(content), 'created_at': int(time()),
+            'filename': f'{file_id}.jsonl', 'purpose': purpose, 'status': 'processed',
+        }
+
+    def run_batch(self, input_file_id: str) -> dict[str, Any]:
+        """Answer all requests of the input file at once; the job reports them after its polls."""
+        results: list[str] = []
+        errors: list[str] = []
+        for line in self.files[input_file_id].decode('utf-8').splitlines():
+            request: dict[str, Any] = loads(line)
+            if self.random.random() < self.error_rate:
+                errors.append(dumps({
+                    'id': f'batch_req_{next(self.ids)}', 'custom_id': request['custom_id'], 'response': None,
+                    'error': {'code': 'server_error', 'message': 'Injected by the stand-in.'},
+                }))
+                continue
+            results.append(dumps({
+                'id': f'batch_req_{next(self.ids)}', 'custom_id': request['custom_id'],
+                'response': {
+                    'status_code': 200, 'request_id': f'req_{next(self.ids)}', 'body': self.completion(request['body'])
+                },
+                'error': None,
+            }, ensure_ascii=False))
+        batch_id: str = f'batch_{next(self.ids)}'
+        self.batches[batch_id] = {
+            'id': batch_id, 'object': 'batch', 'endpoint': '/v1/chat/completions', 'input_file_id': input_file_id,
+            'completion_window': '24h', 'status': 'validating', 'created_at': int(time()),
+            'output_file_id': None, 'error_file_id': None, 'polls': 0,
+            'request_counts': {'total': len(results) + len(errors), 'completed': len(results), 'failed': len(errors)},
+            'pending': ('\n'.join(results).encode('utf-8'), '\n'.join(errors).encode('utf-8')),
+        }
+        return self.batch_view(batch_id)
+
+    def poll(self, batch_id: str) -> dict[str, Any]:
+        batch: dict[str, Any] = self.batches[batch_id]
+        batch['polls'] += 1
+        if batch['status'] != 'completed':
+            batch['status'] = 'in_progress'
+            if batch['polls'] >= self.polls:
+                output, errors = batch['pending']
+                batch['output_file_id'] = self.store_file(output, 'batch_output')['id']
+                batch['error_file_id'] = self.store_file(errors, 'batch_output')['id'] if errors else None
+                batch['status'] = 'completed'
+        return self.batch_view(batch_id)
+
+    def batch_view(self, batch_id: str) -> dict[str, Any]:
+        return {key: value for key, value in self.batches[batch_id].items() if key not in ('polls', 'pending')}
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self) -> None:
+                body: bytes = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with stand_in.lock:
+                    if self.path == '/v1/files':
+                        form = BytesParser().parsebytes(
+                            f'Content-Type: {self.headers["Content-Type"]}\r\n\r\n'.encode() + body
+                        )
+                        fields: dict[str, bytes] = {
+                            part.get_param('name', header='content-disposition'): part.get_payload(decode=True)
+                            for part in form.get_payload()
+                        }
+                        return self.respond(stand_in.store_file(fields['file'], fields['purpose'].decode()))
+                    if self.path == '/v1/batches':
+                        return self.respond(stand_in.run_batch(loads(body)['input_file_id']))
+                    if self.path == '/v1/chat/completions':
+                        stand_in.live_requests += 1
+                        return self.respond(stand_in.completion(loads(body)))
+                self.respond({'error': {'message': f'Unknown path {self.path}'}}, 404)
+
+            def do_GET(self) -> None:
+                parts: list[str] = self.path.strip('/').split('/')
+                with stand_in.lock:
+                    if parts[:2] == ['v1', 'batches'] and len(parts) == 3 and parts[2] in stand_in.batches:
+                        return self.respond(stand_in.poll(parts[2]))
+                    if parts[:2] == ['v1', 'files'] and parts[3:] == ['content'] and parts[2] in stand_in.files:
+                        return self.respond_bytes(stand_in.files[parts[2]], 'application/jsonl')
+                self.respond({'error': {'message': f'Unknown path {self.path}'}}, 404)
+
+            def respond(self, payload: dict[str, Any], status: int = 200) -> None:
+                self.respond_bytes(dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json', status)
+
+            def respond_bytes(self, body: bytes, content_type: str, status: int = 200) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> 'BatchStandIn':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+async def round_trip(input_file_path: str, workdir: str, stand_in: BatchStandIn) -> None:
+    makedirs(workdir, exist_ok=True)
+    name: str = path.splitext(path.basename(input_file_path))[0]
+    batch_file_path: str = path.join(workdir, f'{name}.batch.jsonl')
+    results_file_path: str = path.join(workdir, f'{name}.results.jsonl')
+    categorizer = DataCategorizer(
+        client=AsyncOpenAI(api_key='stand-in', base_url=stand_in.base_url, max_retries=0),
+        governor=LLMRateGovernor(rpm=STAND_IN_LIMIT, tpm=STAND_IN_LIMIT),
+        cache=ResponseCache(':memory:')
+    )
+    started: float = perf_counter()
+    requests: int = await categorizer.build_batch(input_file_path, batch_file_path)
+    built: float = perf_counter()
+    batch_id: str = await categorizer.submit_batch(batch_file_path)
+    await categorizer.download_batch(batch_id, results_file_path, poll_interval=0.01)
+    downloaded: float = perf_counter()
+    await categorizer.ingest_batch(
+        results_file_path, input_file_path, path.join(workdir, f'{name}.json'), path.join(workdir, f'{name}.docx')
+    )
+    ingested: float = perf_counter()
+    with open(path.join(workdir, f'{name}.json'), 'r', encoding='utf-8') as f:
+        flagged: int = len(loads(f.read()))
+    print(f'{requests} batch requests, built in {built - started:.2f}s, round trip {downloaded - built:.2f}s, '
+          f'ingested in {ingested - downloaded:.2f}s')
+    print(f'{flagged} articles with corruption written, {stand_in.live_requests} requests sent live')
+
+
+if __name__ == '__main__':
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument('input', help='articles file, .json or .jsonl')
+    argument_parser.add_argument('--workdir', default='/tmp/batch')
+    argument_parser.add_argument('--error-rate', type=float, default=0.0)
+    arguments = argument_parser.parse_args()
+    with BatchStandIn(error_rate=arguments.error_rate) as server:
+        run(round_trip(arguments.input, arguments.workdir, server))
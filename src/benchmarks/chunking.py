@@ -0,0 +1,107 @@
+"""
+Micro-benchmark of token counting and chunking for the LLM stage.
+
+Times what DataCategorizer does with every text before a request goes out: split it into chunks
+and count each chunk's tokens to pace the request. The original code looked the encoder up and
+encoded every '. '-separated sentence, then encoded each chunk again to count it; core.ai.tokens
+encodes each text once, slices the token array and remembers every chunk's tokens for the count.
+Runs on the article texts of the datasets in `data/`, each repeated `--scale` times to emulate long inputs.
+
+    cd src && python -m benchmarks.chunking [--scale 10] [--max-tokens 1024] [--repeat 3]
+"""
+from argparse import ArgumentParser
+from glob import glob
+from json import load
+from time import perf_counter
+from typing import Callable
+
+import tiktoken
+
+from core.ai import consts
+from core.ai.tokens import (
+    ENCODED, chunk_text, chunk_texts, count_tokens, count_tokens_batch, get_encoder, token_lengths
+)
+
+
+def legacy_split(text: str, max_tokens: int) -> list[str]:
+    """The chunker DataCategorizer used before core.ai.tokens."""
+    chunks, current_chunk, current_chunk_tokens = [], [], 0
+    for sentence in text.split('. '):
+        tokens = len(tiktoken.get_encoding('cl100k_base').encode(sentence))
+        if current_chunk_tokens + tokens <= max_tokens:
+            current_chunk.append(sentence)
+            current_chunk_tokens += tokens
+        else:
+            chunks.append(' '.join(current_chunk))
+            current_chunk, current_chunk_tokens = [sentence], tokens
+    if current_chunk:
+        chunks.append(' '.join(current_chunk))
+    return chunks
+
+
+def legacy_count(text: str) -> int:
+    return len(tiktoken.get_encoding('cl100k_base').encode(text))
+
+
+def load_texts(scale: int) -> list[str]:
+    texts: list[str] = []
+    for file_path in sorted(glob('data/*.json')):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            texts.extend(' '.join([article['short_text']] * scale) for article in load(f) if article.get('short_text'))
+    return texts
+
+
+def timed(
+        label: str,
+        run: Callable[[], list],
+        texts: int,
+        repeat: int,
+        clear: Callable[[], None] = lambda: None
+) -> float:
+    """Best of `repeat` runs; `clear` empties caches first so no run profits from the one before."""
+    best: float = min(_elapsed(run, clear) for _ in range(repeat))
+    print(f'{label:28} {best * 1000:9.1f} ms total {best / texts * 1e6:9.1f} µs/text')
+    return best
+
+
+def _elapsed(run: Callable[[], list], clear: Callable[[], None]) -> float:
+    clear()
+    started: float = perf_counter()
+    run()
+    return perf_counter() - started
+
+
+def main(scale: int, max_tokens: int, repeat: int) -> None:
+    texts: list[str] = load_texts(scale)
+    token_lengths(consts.MODEL)  # load the encoder and its tables outside the timings
+    print(f'{len(texts)} texts, {sum(count_tokens_batch(texts))} tokens, max {max_tokens} tokens per chunk')
+    legacy: float = timed(
+        'legacy split + count',
+        lambda: [legacy_count(chunk) for text in texts for chunk in legacy_split(text, max_tokens)],
+        len(texts),
+        repeat
+    )
+    single: float = timed(
+        'chunk_text + count',
+        lambda: [count_tokens(chunk) for text in texts for chunk in chunk_text(text, max_tokens)],
+        len(texts),
+        repeat,
+        clear=ENCODED.clear
+    )
+    batch: float = timed('chunk_texts (batch encode)', lambda: chunk_texts(texts, max_tokens), len(texts), repeat)
+    print(f'speedup: {legacy / single:.1f}x split + count, {legacy / batch:.1f}x batch split')
+    # Encoded afresh, not taken from the tokens chunk_text remembers for every chunk.
+    encoder = get_encoder()
+    oversized: int = sum(
+        len(encoder.encode_ordinary(chunk)) > max_tokens for chunks in chunk_texts(texts, max_tokens) for chunk in chunks
+    )
+    print(f'chunks over the limit: {oversized}')
+
+
+if __name__ == '__main__':
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument('--scale', type=int, default=10)
+    argument_parser.add_argument('--max-tokens', type=int, default=1024)
+    argument_parser.add_argument('--repeat', type=int, default=3)
+    arguments = argument_parser.parse_args()
+    main(arguments.scale, arguments.max_tokens, arguments.repeat)
@@ -0,0 +1,173 @@
+"""
+Offline end-to-end benchmark of the outlet crawlers.
+
+`record` fetches each outlet's first listing page and a sample of its articles from the live sites
+into `benchmarks/fixtures/<outlet>/`, together with the articles extracted from them. `run` replays
+the fixtures from a local stand-in server with injected latency and errors and reports, per outlet,
+throughput, parse time per page, peak memory and whether extraction still matches `expected.json`.
+
+The committed fixtures are SYNTHETIC: small hand-built pages written around articles of the
+datasets in `data/` to fit each crawler's current selectors. They exercise the crawl pipeline
+offline, but the extraction check passes on them by construction and cannot catch markup drift
+on the real sites. Replace them with `record` once the outlets are reachable.
+
+    cd src && python -m benchmarks.crawlers record [--articles 20]
+    cd src && python -m benchmarks.crawlers run [--latency 0.05] [--jitter 0.05] [--error-rate 0.05]
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from json import dump, load
+from os import path
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Any, Awaitable, Callable
+
+from core.crawler import consts
+from core.crawler.base import BaseCrawler
+from core.crawler.client import HttpClientFactory
+from core.crawler.fetch_engine import FetchEngine
+from core.crawler.rate_control import RateController
+from core.bihus_info import consts as bihus_consts
+from core.bihus_info.bihus_crawler import BihusData
+from core.hromadske.hromadske_crawler import HromadskeData
+from core.nashi_groshi import consts as nashi_groshi_consts
+from core.nashi_groshi.nashi_groshi_crawler import NashiGroshiData
+from core.prot_corruption_shabunin import consts as antac_consts
+from core.prot_corruption_shabunin.prompt_corup_crawler import AntacNewsData
+from core.shemy_radio_svoboda import consts as radio_svoboda_consts
+from core.shemy_radio_svoboda.shemy_crawler import RadioSvobodaData
+from core.ukr_pravda.ukr_pravda_crawler import UkrPravdaData
+from benchmarks.stand_in import FixtureStore, RecordingTransport, StandInServer, StandInTransport
+
+FIXTURES_DIR: str = path.join(path.dirname(__file__), 'fixtures')
+
+
+async def bihus_links(crawler: BihusData) -> list[str]:
+    return bihus_consts.LINKS
+
+
+# How each outlet finds its article links on the first listing page.
+SCENARIOS: dict[type[BaseCrawler], Callable[[Any], Awaitable[list[str] | None]]] = {
+    BihusData: bihus_links,
+    HromadskeData: lambda crawler: crawler.get_all_links(),
+    NashiGroshiData: lambda crawler: crawler.get_first_page_links(nashi_groshi_consts.URL),
+    AntacNewsData: lambda crawler: crawler.get_first_page_links(antac_consts.URL),
+    RadioSvobodaData: lambda crawler: crawler.extract_all_article_links(radio_svoboda_consts.URL),
+    UkrPravdaData: lambda crawler: crawler.get_first_page_links('https://www.pravda.com.ua/news/date_22022025/'),
+}
+
+
+def fixture_dir(crawler_class: type[BaseCrawler]) -> str:
+    return path.join(FIXTURES_DIR, crawler_class.__name__)
+
+
+async def crawl_sample(crawler: BaseCrawler, articles: int) -> tuple[list[str], list[dict[str, str]]]:
+    links: list[str] = (await SCENARIOS[type(crawler)](crawler) or [])[:articles]
+    return links, await crawler.collect_articles(links)
+
+
+async def record(crawler_class: type[BaseCrawler], articles: int) -> None:
+    store: FixtureStore = FixtureStore(fixture_dir(crawler_class))
+    async with HttpClientFactory(use_cache=False, transport=RecordingTransport(store)) as factory:
+        crawler: BaseCrawler = crawler_class(
+            client_factory=factory, rate_controller=RateController(), incremental=False, archive_pages=False,
+            render_listings=False
+        )
+        links, articles_data = await crawl_sample(crawler, articles)
+    store.save()
+    with open(path.join(store.directory, 'expected.json'), 'w', encoding='utf-8') as f:
+        dump({'links': links, 'articles': articles_data}, f, ensure_ascii=False, indent=4)
+    print(f'{crawler_class.__name__}: recorded {len(store)} pages, {len(articles_data)} articles')
+
+
+async def crawl_offline(
+        crawler_class: type[BaseCrawler],
+        server: StandInServer,
+        articles: int,
+        concurrency: int,
+        per_host: int,
+        parser: str
+) -> tuple[float, list[dict[str, str]], BaseCrawler]:
+    transport: StandInTransport = StandInTransport(server.port)
+    async with HttpClientFactory(use_cache=False, http2=False, transport=transport) as factory:
+        crawler: BaseCrawler = crawler_class(
+            engine=FetchEngine(concurrency, per_host),
+            client_factory=factory,
+            rate_controller=RateController(),
+            incremental=False,
+            archive_pages=False,
+            render_listings=False,
+            parser=parser
+        )
+        started: float = perf_counter()
+        _, articles_data = await crawl_sample(crawler, articles)
+        return perf_counter() - started, articles_data, crawler
+
+
+def extraction_status(articles_data: list[dict[str, str]], expected: list[dict[str, str]]) -> str:
+    by_link: dict[str, dict[str, str]] = {article['link']: article for article in articles_data}
+    differing: int = sum(by_link.get(article['link']) != article for article in expected)
+    return 'ok' if not differing and len(by_link) == len(expected) else f'MISMATCH {differing}/{len(expected)}'
+
+
+async def benchmark(crawler_class: type[BaseCrawler], server: StandInServer, arguments: Any) -> None:
+    with open(path.join(fixture_dir(crawler_class), 'expected.json'), 'r', encoding='utf-8') as f:
+        expected: dict[str, list] = load(f)
+    articles: int = len(expected['links'])
+    options: tuple = (articles, arguments.concurrency, arguments.per_host, arguments.parser)
+    timings: list[float] = []
+    for _ in range(arguments.repeat):
+        elapsed, articles_data, crawler = await crawl_offline(crawler_class, server, *options)
+        timings.append(elapsed)
+    start()
+    await crawl_offline(crawler_class, server, *options)
+    peak_mib: float = get_traced_memory()[1] / 2 ** 20
+    stop()
+    best: float = min(timings)
+    pages: int = sum(histogram.count for histogram in crawler.metrics.fetch_latency.values())
+    print(
+        f'{crawler_class.__name__:18} {pages / best:8.1f} pages/s {len(articles_data) / best:8.1f} articles/s '
+        f'{crawler.metrics.parse_time.summary()["mean"] * 1000:7.2f} ms parse/page {peak_mib:7.1f} MiB peak '
+        f'retries={sum(crawler.metrics.retries.values())} errors={sum(crawler.metrics.fetch_errors.values())} '
+        f'{extraction_status(articles_data, expected["articles"])}'
+    )
+
+
+async def main(arguments: Any) -> None:
+    crawler_classes: list[type[BaseCrawler]] = [
+        crawler_class for crawler_class in SCENARIOS
+        if not arguments.outlets or crawler_class.__name__ in arguments.outlets
+    ]
+    if arguments.command == 'record':
+        for crawler_class in crawler_classes:
+            await record(crawler_class, arguments.articles)
+        return
+    if not (recorded := [
+        crawler_class for crawler_class in crawler_classes
+        if path.exists(path.join(fixture_dir(crawler_class), 'expected.json'))
+    ]):
+        print(f'No fixtures in {FIXTURES_DIR}, run `python -m benchmarks.crawlers record` first.')
+        return
+    stores: list[FixtureStore] = [FixtureStore(fixture_dir(crawler_class)) for crawler_class in recorded]
+    with StandInServer(
+            stores, arguments.latency, arguments.jitter, arguments.error_rate, retry_after=arguments.retry_after
+    ) as server:
+        for crawler_class in recorded:
+            await benchmark(crawler_class, server, arguments)
+        print(f'stand-in: {server.summary()}')
+
+
+if __name__ == '__main__':
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument('command', choices=['record', 'run'])
+    argument_parser.add_argument('outlets', nargs='*', help='crawler class names, all outlets by default')
+    argument_parser.add_argument('--articles', type=int, default=20, help='articles recorded per outlet')
+    argument_parser.add_argument('--latency', type=float, default=0.05)
+    argument_parser.add_argument('--jitter', type=float, default=0.05)
+    argument_parser.add_argument('--error-rate', type=float, default=0.05)
+    argument_parser.add_argument('--retry-after', type=float, default=0.0)
+    argument_parser.add_argument('--concurrency', type=int, default=consts.GLOBAL_CONCURRENCY)
+    argument_parser.add_argument('--per-host', type=int, default=consts.PER_HOST_CONCURRENCY)
+    argument_parser.add_argument('--parser', default=consts.PARSER_BACKEND)
+    argument_parser.add_argument('--repeat', type=int, default=3)
+    run(main(argument_parser.parse_args()))
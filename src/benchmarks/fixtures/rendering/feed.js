@@ -0,0 +1,17 @@
+// Infinite feed of the hand-built Hromadske listing: scrolling to the bottom loads the next items.
+(function () {
+  let loading = false;
+
+  async function loadMore() {
+    const loader = document.querySelector('.c-feed__loader');
+    if (loading || !loader || !loader.dataset.nextPage) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+    loading = true;
+    const response = await fetch(loader.dataset.nextPage);
+    document.querySelector('.c-feed').insertAdjacentHTML('beforeend', await response.text());
+    loader.dataset.nextPage = response.headers.get('X-Next-Page') || '';
+    loading = false;
+  }
+
+  window.addEventListener('scroll', loadMore);
+})();
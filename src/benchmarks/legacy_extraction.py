@@ -0,0 +1,109 @@
+"""
+The per-crawler article extraction from before the selector extractor, kept as the reference the
+parser benchmark compares against. Each function applies one outlet's original extract_* logic
+unchanged to an article page parsed with html.parser; only the fetching and logging are left out.
+"""
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+
+def _text(tag) -> str | None:
+    return tag.get_text(strip=True) if tag else None
+
+
+def bihus(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    content_div = soup.find('div', class_='bi-single-content')
+    paragraphs = content_div.find_all(['h4', 'p']) if content_div else None
+    return {
+        'date': _text(soup.find('time', class_='bi-intro-post__time bi-single__meta-item')),
+        'link': article_url,
+        'title': _text(soup.find('h1', class_='bi-single__title')),
+        'author': 'Not given',
+        'short_text': (
+            ' '.join([p.get_text(strip=True) for p in paragraphs[:5]]) if paragraphs else 'No Text'
+        ) if content_div else None
+    }
+
+
+def hromadske(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    paragraphs = soup.find_all('p', class_='text-start')
+    return {
+        'date': _text(soup.find('time', class_='c-post-header__date')),
+        'link': article_url,
+        'title': _text(soup.find('h1', class_='c-heading__title')),
+        'author': _text(soup.find('a', class_='c-post-author__name')),
+        'short_text': ' '.join([p.get_text(strip=True) for p in paragraphs[:5]]) if paragraphs else None
+    }
+
+
+def nashi_groshi(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    title_tag = soup.find('h6', class_='title')
+    date_tag = soup.find('span', class_='meta')
+    main_content = soup.find('div', class_='main-content')
+    paragraphs = soup.find_all('p')
+    return {
+        'date': date_tag.get_text(strip=True).split('  //')[0].replace('\xa0', '').replace('\n', '').strip()
+        if date_tag else None,
+        'link': article_url,
+        'title': (title_tag.find('strong').get_text(strip=True) if title_tag else 'No Title') or None,
+        'author': main_content.find_all('p')[-1].get_text(strip=True) if main_content else None,
+        'short_text': ' '.join([p.get_text(strip=True) for p in paragraphs[:3]]) if paragraphs else None
+    }
+
+
+def antac(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    paragraphs = soup.find_all('p')
+    return {
+        'date': _text(soup.find('time', class_='single-post-heading__date')),
+        'link': article_url,
+        'title': _text(soup.find('h1', class_='heading-section__title')),
+        'author': _text(soup.find('span', class_='author')),
+        'short_text': ' '.join([p.get_text(strip=True) for p in paragraphs[:3]]) if paragraphs else None
+    }
+
+
+def radio_svoboda(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    date_tag = soup.find('div', class_='published')
+    time_tag = date_tag.find('time') if date_tag else None
+    paragraphs = soup.find_all('p')
+    return {
+        'date': time_tag.get_text(strip=True).replace('\xa0', '').replace('\n', '').strip() if time_tag else None,
+        'link': article_url,
+        'title': _text(soup.find('title')),
+        'author': _text(soup.find('a', class_='links__item-link')),
+        'short_text': ' '.join([p.get_text(strip=True) for p in paragraphs[:5]]) if paragraphs else None
+    }
+
+
+def ukr_pravda(soup: BeautifulSoup, article_url: str) -> dict[str, str | None]:
+    title_tag = soup.find('h1')
+    if post_time_tag := soup.find('div', class_='post_time'):
+        author_tag = post_time_tag.find('span', class_='post_author')
+        author = author_tag.get_text(strip=True).replace(' —', '') if author_tag else 'Unknown Author'
+        post_date = post_time_tag.get_text(strip=True).split('—')[-1].strip()
+    else:
+        author = 'Unknown Author'
+        post_date = 'Unknown Date'
+    post_text_tag = soup.find('div', class_='post_text')
+    return {
+        'date': post_date,
+        'link': article_url,
+        'title': title_tag.get_text(strip=True) if title_tag else 'No Title',
+        'author': author,
+        'short_text': post_text_tag.get_text(strip=True) if post_text_tag else 'No Short Text'
+    }
+
+
+LEGACY_EXTRACTORS: dict[str, Callable[[BeautifulSoup, str], dict[str, str | None]]] = {
+    'BihusData': bihus,
+    'HromadskeData': hromadske,
+    'NashiGroshiData': nashi_groshi,
+    'AntacNewsData': antac,
+    'RadioSvobodaData': radio_svoboda,
+    'UkrPravdaData': ukr_pravda,
+}
+
+
+def legacy_extract(outlet: str, response: str, article_url: str) -> dict[str, str | None]:
+    return LEGACY_EXTRACTORS[outlet](BeautifulSoup(response, 'html.parser'), article_url)
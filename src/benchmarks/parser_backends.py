@@ -0,0 +1,87 @@
+"""
+Per-site comparison of HTML parser backends for article extraction, offline.
+
+Reads the article pages of each outlet from the crawler fixtures in `benchmarks/fixtures/` (see
+`benchmarks.crawlers`), then times `parse_article` with every backend, with and without the
+outlet's `parse_only` restriction. Each configuration is checked field by field against the
+pre-series per-crawler extraction kept in `benchmarks.legacy_extraction`. While the committed
+fixtures are synthetic, this shows the backends agree with the original code on those pages only.
+
+    cd src && python -m benchmarks.parser_backends [--repeat 3]
+"""
+from argparse import ArgumentParser
+from asyncio import run
+from sys import exit
+from json import load
+from os import path
+from time import perf_counter
+
+from core.crawler.base import BaseCrawler
+from core.bihus_info.bihus_crawler import BihusData
+from core.hromadske.hromadske_crawler import HromadskeData
+from core.nashi_groshi.nashi_groshi_crawler import NashiGroshiData
+from core.prot_corruption_shabunin.prompt_corup_crawler import AntacNewsData
+from core.shemy_radio_svoboda.shemy_crawler import RadioSvobodaData
+from core.ukr_pravda.ukr_pravda_crawler import UkrPravdaData
+from benchmarks.crawlers import fixture_dir
+from benchmarks.legacy_extraction import legacy_extract
+from benchmarks.stand_in import FixtureStore, fixture_key
+
+SITES: list[type[BaseCrawler]] = [
+    BihusData, HromadskeData, NashiGroshiData, AntacNewsData, RadioSvobodaData, UkrPravdaData
+]
+CONFIGS: list[tuple[str, bool]] = [
+    ('html.parser', False),
+    ('html.parser', True),
+    ('lxml', False),
+    ('lxml', True),
+]
+
+
+def load_pages(crawler_class: type[BaseCrawler]) -> list[tuple[str, str]]:
+    """(link, html) of every article page recorded for the outlet."""
+    if not path.exists(expected_path := path.join(fixture_dir(crawler_class), 'expected.json')):
+        return []
+    store: FixtureStore = FixtureStore(fixture_dir(crawler_class))
+    with open(expected_path, 'r', encoding='utf-8') as f:
+        links: list[str] = [article['link'] for article in load(f)['articles']]
+    return [(link, page[2].decode('utf-8')) for link in links if (page := store.get(fixture_key(link)))]
+
+
+def differing_fields(results: list[dict | None], reference: list[dict]) -> int:
+    return sum(
+        (result or {}).get(field) != value
+        for result, expected in zip(results, reference) for field, value in expected.items()
+    )
+
+
+async def benchmark_site(crawler_class: type[BaseCrawler], repeat: int) -> int:
+    if not (samples := load_pages(crawler_class)):
+        print(f'{crawler_class.__name__}: no fixtures, skipping')
+        return 0
+    reference: list[dict] = [legacy_extract(crawler_class.__name__, response, link) for link, response in samples]
+    mismatches: int = 0
+    for parser, restrict in CONFIGS:
+        crawler: BaseCrawler = crawler_class(
+            incremental=False, archive_pages=False, render_listings=False, parser=parser, restrict_parsing=restrict
+        )
+        started: float = perf_counter()
+        for _ in range(repeat):
+            results = [await crawler.parse_article(response, link) for link, response in samples]
+        per_page_ms: float = (perf_counter() - started) / (repeat * len(samples)) * 1000
+        differing: int = differing_fields(results, reference)
+        mismatches += bool(differing)
+        status: str = 'ok' if not differing else f'MISMATCH {differing} fields'
+        print(f'{crawler_class.__name__:18} {parser:12} restrict={restrict!s:5} {per_page_ms:8.2f} ms/page  {status}')
+    return mismatches
+
+
+async def main(repeat: int) -> int:
+    return sum([await benchmark_site(crawler_class, repeat) for crawler_class in SITES])
+
+
+if __name__ == '__main__':
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument('--repeat', type=int, default=3)
+    arguments = argument_parser.parse_args()
+    exit(1 if run(main(arguments.repeat)) else 0)
@@ -0,0 +1,299 @@
+"""
+Offline check of listing rendering, against local HTML fixtures of the Hromadske news feed.
+
+The render pool cases drive the real RenderPool through a local HTTP server that serves the
+listing as published, its infinite-scroll script and the next feed items, plus an image, a font
+and a video. They check rendering, scrolling, the blocked-resource route, the cap on concurrent
+renders, page reuse, replacement of failed pages and restarting after close. They need a
+Chromium that Playwright can launch (`playwright install chromium`, or `--browser PATH`) and are
+reported as SKIPPED otherwise.
+
+The crawler cases check how HromadskeData uses the render pool, with stand-ins for it and a mock
+transport for plain fetches: rendered listings, falling back to a plain fetch when rendering
+fails, rendering turned off, and a listing that cannot be fetched at all.
+
+Exits non-zero when a case fails.
+
+    cd src && python -m benchmarks.rendering [--browser /usr/bin/chromium]
+"""
+from argparse import ArgumentParser
+from asyncio import gather, run
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+from socket import socket
+from sys import exit
+from threading import Lock, Thread
+from time import sleep
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+from httpx import MockTransport, Request, Response
+
+from core.crawler.client import HttpClientFactory
+from core.crawler.rate_control import RateController
+from core.crawler.rendering import RenderPool, playwright_available
+from core.hromadske import consts as hromadske_consts
+from core.hromadske.hromadske_crawler import HromadskeData
+
+FIXTURES_DIR: str = path.join(path.dirname(__file__), 'fixtures', 'rendering')
+FEED_PAGE_SIZE: int = 4
+# Served by the fixture server; the render pool must never request the first three.
+BLOCKED_ASSETS: dict[str, str] = {
+    '/static/banner.jpg': 'image/jpeg',
+    '/static/feed-sans.woff2': 'font/woff2',
+    '/static/promo.mp4': 'video/mp4',
+}
+ALLOWED_ASSETS: dict[str, tuple[str, str]] = {
+    '/static/feed.js': ('feed.js', 'text/javascript'),
+    '/static/feed.css': ('feed.css', 'text/css'),
+}
+POOL_SIZE: int = 2
+CONCURRENT_RENDERS: int = 6
+
+
+def read_fixture(name: str) -> str:
+    with open(path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def feed_links(html: str) -> list[str]:
+    return [a['href'] for a in BeautifulSoup(html, 'html.parser').select('article.c-feed-item a')]
+
+
+class ListingServer:
+    """
+    Threaded local server for the feed fixtures. `/news` is the listing as served, `/news?page=N`
+    the feed items the scroll script appends, and `?delay=S` holds a listing response for S
+    seconds. Requests per path and the most listing requests in flight at once are counted.
+    """
+
+    def __init__(self):
+        self.listing: str = read_fixture('hromadske_listing.html')
+        rendered: BeautifulSoup = BeautifulSoup(read_fixture('hromadske_listing_rendered.html'), 'html.parser')
+        self.items: list[str] = [str(item) for item in rendered.select('article.c-feed-item')]
+        self.requests: Counter = Counter()
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.lock: Lock = Lock()
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread: Thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server.server_address[1]}/news'
+
+    def feed_page(self, page: int) -> tuple[str, str | None]:
+        """The items of one feed page and the path of the next one, if any."""
+        start: int = (page - 1) * FEED_PAGE_SIZE
+        next_page: str | None = f'/news?page={page + 1}' if start + FEED_PAGE_SIZE < len(self.items) else None
+        return '\n'.join(self.items[start:start + FEED_PAGE_SIZE]), next_page
+
+    def listing_response(self, query: dict[str, list[str]]) -> tuple[str, dict[str, str]]:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            sleep(float(query.get('delay', ['0'])[0]))
+            if (page := int(query.get('page', ['1'])[0])) == 1:
+                return self.listing, {}
+            items, next_page = self.feed_page(page)
+            return items, {'X-Next-Page': next_page} if next_page else {}
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests.clear()
+            self.max_in_flight = 0
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        listing_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                parts = urlsplit(self.path)
+                with listing_server.lock:
+                    listing_server.requests[parts.path] += 1
+                if parts.path == '/news':
+                    body, headers = listing_server.listing_response(parse_qs(parts.query))
+                    return self.respond(body.encode('utf-8'), 'text/html; charset=utf-8', headers)
+                if parts.path in ALLOWED_ASSETS:
+                    name, content_type = ALLOWED_ASSETS[parts.path]
+                    return self.respond(read_fixture(name).encode('utf-8'), content_type)
+                if parts.path in BLOCKED_ASSETS:
+                    return self.respond(b'\0' * 64, BLOCKED_ASSETS[parts.path])
+                self.respond(b'', 'text/plain', status=404)
+
+            def respond(self, body: bytes, content_type: str, headers: dict[str, str] | None = None,
+                        status: int = 200) -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> 'ListingServer':
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def closed_port_url() -> str:
+    with socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{s.getsockname()[1]}/news'
+
+
+async def pool_cases(server: ListingServer, pool: RenderPool) -> list[tuple[str, bool, str]]:
+    """(case, passed, detail) of every render pool case, run in order on one pool."""
+    results: list[tuple[str, bool, str]] = []
+    static: list[str] = feed_links(server.listing)
+    scrolled: list[str] = feed_links(read_fixture('hromadske_listing_rendered.html'))
+
+    links: list[str] = feed_links(await pool.render(server.url))
+    results.append(('listing as served', links == static, f'{len(links)} links'))
+
+    links = feed_links(await pool.render(server.url, scrolls=2))
+    results.append(('scrolling loads the feed', links == scrolled, f'{len(links)} links'))
+    # Checked after the scrolled render, which leaves time for the page's stylesheet, font and media requests.
+    blocked: list[str] = [asset for asset in BLOCKED_ASSETS if server.requests[asset]]
+    loaded: list[str] = [asset for asset in ALLOWED_ASSETS if server.requests[asset]]
+    results.append((
+        'images, fonts and media blocked',
+        not blocked and len(loaded) == len(ALLOWED_ASSETS),
+        f'requested {blocked or "none"} of the blocked assets, {len(loaded)}/{len(ALLOWED_ASSETS)} others'
+    ))
+
+    server.reset()
+    pages: list[str] = await gather(*(
+        pool.render(f'{server.url}?delay=0.3') for _ in range(CONCURRENT_RENDERS)
+    ))
+    results.append((
+        'concurrent renders capped',
+        server.max_in_flight == pool.size and all(feed_links(html) == static for html in pages),
+        f'{server.max_in_flight} of {CONCURRENT_RENDERS} in flight, pool size {pool.size}'
+    ))
+    contexts: int = len(pool.browser.contexts)
+    results.append(('pages reused', contexts == pool.size, f'{contexts} contexts after {pool.renders} renders'))
+
+    try:
+        await pool.render(closed_port_url())
+        failed: bool = False
+    except Exception:
+        failed = True
+    links = feed_links(await pool.render(server.url))
+    contexts = len(pool.browser.contexts)
+    results.append((
+        'failed page replaced',
+        failed and links == static and contexts <= pool.size,
+        f'{"raised" if failed else "did not raise"}, then {len(links)} links, {contexts} contexts'
+    ))
+
+    await pool.aclose()
+    links = feed_links(await pool.render(server.url))
+    results.append(('render after close', links == static, f'{len(links)} links'))
+    return results
+
+
+async def render_pool_checks(browser: str | None) -> int:
+    if not playwright_available():
+        print('render pool cases SKIPPED: playwright is not installed')
+        return 0
+    failed: int = 0
+    with ListingServer() as server:
+        async with RenderPool(size=POOL_SIZE, timeout=10.0, scroll_pause=0.5, executable_path=browser) as pool:
+            try:
+                await pool.start()
+            except Exception as e:
+                print(f'render pool cases SKIPPED: cannot launch a browser: {str(e).splitlines()[0]}')
+                return 0
+            for name, passed, detail in await pool_cases(server, pool):
+                failed += not passed
+                print(f'render pool: {name:34} {detail}  {"ok" if passed else "FAILED"}')
+    return failed
+
+
+class FixtureRenderer:
+    """Answers every render with the rendered fixture, like a RenderPool that scrolled the feed."""
+
+    def __init__(self, html: str):
+        self.html: str = html
+        self.renders: int = 0
+
+    async def render(self, url: str, scrolls: int = 0) -> str:
+        self.renders += 1
+        return self.html
+
+
+class FailingRenderer:
+    """A RenderPool whose browser cannot load the page."""
+
+    async def render(self, url: str, scrolls: int = 0) -> str:
+        raise TimeoutError(f'Timeout exceeded loading {url}')
+
+
+def serve(listing: str | None) -> Callable[[Request], Response]:
+    def handler(request: Request) -> Response:
+        if listing is not None and str(request.url) == hromadske_consts.URL:
+            return Response(200, headers={'content-type': 'text/html; charset=utf-8'}, text=listing)
+        return Response(503)
+    return handler
+
+
+async def listing_links(renderer: Any, listing: str | None) -> list[str] | None:
+    async with HttpClientFactory(use_cache=False, http2=False, transport=MockTransport(serve(listing))) as factory:
+        crawler = HromadskeData(
+            client_factory=factory,
+            rate_controller=RateController(max_attempts=1),
+            incremental=False,
+            archive_pages=False,
+            renderer=renderer,
+            render_listings=renderer is not None
+        )
+        return await crawler.get_all_links()
+
+
+async def crawler_checks() -> int:
+    static: str = read_fixture('hromadske_listing.html')
+    rendered: str = read_fixture('hromadske_listing_rendered.html')
+    cases: list[tuple[str, Callable[[], Awaitable[list[str] | None]], list[str] | None]] = [
+        ('rendered listing', lambda: listing_links(FixtureRenderer(rendered), static), feed_links(rendered)),
+        ('render error falls back to fetch', lambda: listing_links(FailingRenderer(), static), feed_links(static)),
+        ('rendering off', lambda: listing_links(None, static), feed_links(static)),
+        ('render and fetch error', lambda: listing_links(FailingRenderer(), None), None),
+    ]
+    failed: int = 0
+    for name, case, expected in cases:
+        links: list[str] | None = await case()
+        status: str = 'ok' if links == expected else f'MISMATCH, expected {expected}, got {links}'
+        failed += links != expected
+        print(f'crawler: {name:34} {len(links) if links is not None else "-":>3} links  {status}')
+    return failed
+
+
+async def main(browser: str | None) -> int:
+    return await render_pool_checks(browser) + await crawler_checks()
+
+
+if __name__ == '__main__':
+    argument_parser = ArgumentParser(description=__doc__)
+    argument_parser.add_argument(
+        '--browser', default=None, help='Chromium-based browser to launch instead of Playwright\'s own.'
+    )
+    arguments = argument_parser.parse_args()
+    exit(1 if run(main(arguments.browser)) else 0)
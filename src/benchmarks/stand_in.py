@@ -0,0 +1,188 @@
+"""
+Recorded page fixtures and a local HTTP stand-in that replays them, so crawler benchmarks never
+touch the real sites. Fixtures of one outlet live in one directory: a gzipped body per URL plus
+`manifest.json` mapping each URL (without scheme) to its body file, status and headers.
+"""
+from gzip import compress, decompress
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dump, load
+from os import makedirs, path
+from random import Random
+from threading import Lock, Thread
+from time import sleep
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+from httpx import AsyncBaseTransport, AsyncHTTPTransport, Limits, Request, Response
+
+STAND_IN_HOST_HEADER: Final[str] = 'X-Stand-In-Host'
+RECORDED_HEADERS: Final[tuple[str, ...]] = ('content-type', 'location')
+
+
+def fixture_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f'{parts.netloc}{parts.path or "/"}' + (f'?{parts.query}' if parts.query else '')
+
+
+class FixtureStore:
+    """The recorded pages of one outlet."""
+
+    def __init__(self, directory: str):
+        self.directory: str = directory
+        self.manifest_path: str = path.join(directory, 'manifest.json')
+        self.manifest: dict[str, dict[str, Any]] = {}
+        if path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = load(f)
+
+    def __len__(self) -> int:
+        return len(self.manifest)
+
+    def add(self, url: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        key: str = fixture_key(url)
+        file_name: str = f'{sha1(key.encode()).hexdigest()}.html.gz'
+        makedirs(self.directory, exist_ok=True)
+        with open(path.join(self.directory, file_name), 'wb') as f:
+            f.write(compress(body))
+        self.manifest[key] = {'file': file_name, 'status': status, 'headers': headers}
+
+    def get(self, key: str) -> tuple[int, dict[str, str], bytes] | None:
+        if not (entry := self.manifest.get(key)):
+            return
+        with open(path.join(self.directory, entry['file']), 'rb') as f:
+            return entry['status'], entry['headers'], decompress(f.read())
+
+    def save(self) -> None:
+        makedirs(self.directory, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            dump(self.manifest, f, ensure_ascii=False, indent=4, sort_keys=True)
+
+
+class RecordingTransport(AsyncBaseTransport):
+    """Passes requests to the real transport and stores every response in a FixtureStore."""
+
+    def __init__(self, store: FixtureStore, transport: AsyncBaseTransport | None = None):
+        self.store: FixtureStore = store
+        self.transport: AsyncBaseTransport = transport or AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        response: Response = await self.transport.handle_async_request(request)
+        body: bytes = await response.aread()
+        headers: dict[str, str] = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        self.store.add(str(request.url), response.status_code, headers, body)
+        return Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class StandInServer:
+    """
+    Threaded local HTTP server answering from fixture stores. Every response waits `latency` plus
+    up to `jitter` seconds, and a seeded `error_rate` share of requests gets `error_status` instead.
+    Unrecorded URLs get a 404. Use it as a context manager to start and stop it.
+    """
+
+    def __init__(
+            self,
+            stores: list[FixtureStore],
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            error_rate: float = 0.0,
+            error_status: int = 503,
+            retry_after: float | None = None,
+            seed: int = 0
+    ):
+        self.stores: list[FixtureStore] = stores
+        self.latency: float = latency
+        self.jitter: float = jitter
+        self.error_rate: float = error_rate
+        self.error_status: int = error_status
+        self.retry_after: float | None = retry_after
+        self.random: Random = Random(seed)
+        self.lock: Lock = Lock()
+        self.served: int = 0
+        self.injected_errors: int = 0
+        self.missing: int = 0
+        self.server: ThreadingHTTPServer = ThreadingHTTPServer(('127.0.0.1', 0), self.handler())
+        self.server.daemon_threads = True
+        self.thread: Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def lookup(self, key: str) -> tuple[int, dict[str, str], bytes] | None:
+        return next((page for store in self.stores if (page := store.get(key))), None)
+
+    def draw(self) -> tuple[float, bool]:
+        """Delay and error decision for one request; the shared Random is not thread-safe."""
+        with self.lock:
+            return self.latency + self.random.uniform(0, self.jitter), self.random.random() < self.error_rate
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        stand_in: StandInServer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self) -> None:
+                delay, fail = stand_in.draw()
+                sleep(delay)
+                key: str = f'{self.headers.get(STAND_IN_HOST_HEADER, "")}{self.path}'
+                if fail:
+                    stand_in.injected_errors += 1
+                    headers = {'retry-after': str(stand_in.retry_after)} if stand_in.retry_after is not None else {}
+                    self.respond(stand_in.error_status, headers, b'')
+                elif page := stand_in.lookup(key):
+                    stand_in.served += 1
+                    self.respond(*page)
+                else:
+                    stand_in.missing += 1
+                    self.respond(404, {}, b'')
+
+            def respond(self, status: int, headers: dict[str, str], body: bytes) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('content-length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def summary(self) -> dict[str, int]:
+        return {'served': self.served, 'injected_errors': self.injected_errors, 'missing': self.missing}
+
+    def __enter__(self) -> 'StandInServer':
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandInTransport(AsyncBaseTransport):
+    """Sends every request to the stand-in server, passing the original host in a header."""
+
+    def __init__(self, port: int, limits: Limits | None = None):
+        self.port: int = port
+        self.transport: AsyncHTTPTransport = AsyncHTTPTransport(limits=limits or Limits())
+
+    async def handle_async_request(self, request: Request) -> Response:
+        local: Request = Request(
+            request.method,
+            request.url.copy_with(scheme='http', host='127.0.0.1', port=self.port),
+            headers={**request.headers, STAND_IN_HOST_HEADER: request.url.netloc.decode()},
+            extensions=request.extensions
+        )
+        return await self.transport.handle_async_request(local)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
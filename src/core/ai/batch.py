@@ -0,0 +1,33 @@
+from json import JSONDecodeError, loads
+from typing import Any, Iterator
+
+from loguru import logger
+
+from core.ai import consts
+
+
+def batch_line(custom_id: str, body: dict[str, Any]) -> dict[str, Any]:
+    """One request of a provider batch-job input file."""
+    return {'custom_id': custom_id, 'method': 'POST', 'url': consts.BATCH_ENDPOINT, 'body': body}
+
+
+def read_batch_results(file_path: str) -> Iterator[tuple[str, str]]:
+    """(custom_id, completion) of every fully answered request in a batch-job output file; failures are logged."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                result = loads(line)
+                response = result.get('response') or {}
+                if response.get('status_code') != 200:
+                    logger.warning(f'Batch request {result.get("custom_id")} failed: {result.get("error") or response}')
+                    continue
+                choice = response['body']['choices'][0]
+                if choice.get('finish_reason') != 'stop':
+                    # Left out like failures, so the request is sent again live instead of caching a cut answer.
+                    logger.warning(f'Batch request {result["custom_id"]} stopped by {choice.get("finish_reason")}.')
+                    continue
+                yield result['custom_id'], (choice['message']['content'] or '').strip()
+            except (JSONDecodeError, KeyError, IndexError, TypeError) as e:
+                logger.warning(f'Skipping a malformed batch result line: {e!r}')
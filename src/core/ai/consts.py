@@ -0,0 +1,57 @@
+from typing import Final
+
+MODEL: Final[str] = 'gpt-3.5-turbo'
+SYSTEM_PROMPT: Final[str] = 'Ви корисний асистент, який визначає корупційний контент.'
+TEMPERATURE: Final[float] = 0.5
+REQUEST_TIMEOUT: Final[float] = 60.0
+
+# Encoding for models tiktoken does not know, threads for batch encoding and recent texts whose tokens are kept.
+FALLBACK_ENCODING: Final[str] = 'cl100k_base'
+ENCODE_THREADS: Final[int] = 8
+ENCODED_TEXTS_CACHED: Final[int] = 128
+CHUNK_MAX_TOKENS: Final[int] = 4096
+
+# Context windows (prompt plus completion) of the models in use, and the cap on a single request below them.
+CONTEXT_WINDOWS: Final[dict[str, int]] = {
+    'gpt-3.5-turbo': 16_385,
+    'gpt-4o': 128_000,
+    'gpt-4o-mini': 128_000,
+    'gpt-4-turbo': 128_000,
+}
+DEFAULT_CONTEXT_WINDOW: Final[int] = 4096
+REQUEST_MAX_TOKENS: Final[int] = 8192
+# Tokens reserved for where a prompt template joins the article, which may tokenize differently than apart.
+JOIN_TOKEN_MARGIN: Final[int] = 4
+
+# Ask for the corruption flag, schemes and entities in one JSON response per chunk instead of two passes.
+COMBINED_EXTRACTION: Final[bool] = True
+# Pack consecutive short articles into one combined request, with room in the answer for each of them:
+# the completion budget grows by PACKED_COMPLETION_TOKENS for every article in the pack.
+PACK_ARTICLES: Final[bool] = True
+PACK_MAX_ARTICLES: Final[int] = 8
+PACKED_COMPLETION_TOKENS: Final[int] = 1000
+
+# Completions in flight across all articles, and articles processed at once by process_json_file.
+LLM_CONCURRENCY: Final[int] = 8
+ARTICLES_IN_FLIGHT: Final[int] = 16
+
+# Provider limits the governor keeps under, and the retry policy for 429s, 5xx and timeouts.
+RPM_LIMIT: Final[float] = 3500
+TPM_LIMIT: Final[float] = 200_000
+# Tokens the chat format adds per message and to prime the reply, on top of the message contents.
+MESSAGE_TOKEN_OVERHEAD: Final[int] = 4
+REPLY_TOKEN_OVERHEAD: Final[int] = 3
+RETRY_ATTEMPTS: Final[int] = 5
+RETRY_BASE_DELAY: Final[float] = 1.0
+RETRY_MAX_DELAY: Final[float] = 60.0
+
+# Completions kept on disk, keyed by a hash of model, messages, temperature and max_tokens.
+RESPONSE_CACHE_PATH: Final[str] = 'llm_cache.sqlite'
+RESPONSE_CACHE_MAX_BYTES: Final[int] = 256 * 1024 * 1024
+RESPONSE_CACHE_TTL: Final[float | None] = 30 * 24 * 60 * 60
+
+# Provider batch jobs: the endpoint their requests go to, how long the provider may take and how often to poll.
+BATCH_ENDPOINT: Final[str] = '/v1/chat/completions'
+BATCH_COMPLETION_WINDOW: Final[str] = '24h'
+BATCH_POLL_INTERVAL: Final[float] = 60.0
+BATCH_FINAL_STATUSES: Final[frozenset[str]] = frozenset({'completed', 'failed', 'expired', 'cancelled'})
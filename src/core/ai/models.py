@@ -28,3 +28,46 @@ class Categories(BaseModel):
         ),
         default=False
     )
+
+
+class Individual(BaseModel):
+    name: str
+    position: str | None = None
+    affiliations: list[str] = Field(default_factory=list)
+
+
+class LegalEntity(BaseModel):
+    entity: str
+    type: str | None = Field(description='Державна або приватна', default=None)
+
+
+class Entities(BaseModel):
+    """Entities of one article chunk, in the shape corruption_data_only has always written."""
+    individuals: list[Individual] = Field(default_factory=list)
+    legal_entities: list[LegalEntity] = Field(default_factory=list)
+    offshore: list[str] = Field(default_factory=list)
+    government_bodies: list[str] = Field(default_factory=list)
+
+
+class CorruptionScheme(BaseModel):
+    type: str = Field(description='Тип корупції з наведеного переліку')
+    message: str = Field(description='Як саме цей тип корупції згадано в тексті')
+
+
+class ArticleExtraction(IsCorruption):
+    """Corruption flag, scheme types and entities of an article chunk, answered in a single request."""
+    # Redeclared without IsCorruption's special-token markers, which the schema would carry into the prompt.
+    is_corruption_present: bool = Field(
+        description='Чи йдеться в тексті новини про корупцію', default=False
+    )
+    corruption_schemes: list[CorruptionScheme] = Field(default_factory=list)
+    entities: Entities = Field(default_factory=Entities)
+
+
+class PackedArticle(ArticleExtraction):
+    id: str = Field(description='Значення атрибута id статті')
+
+
+class PackedExtraction(BaseModel):
+    """Answers for several articles sent in one request, keyed by the article ids."""
+    articles: list[PackedArticle] = Field(default_factory=list)
@@ -1,113 +1,282 @@
+import sqlite3
+from asyncio import Semaphore, Task, create_task, gather, sleep
+from collections import deque
+from random import uniform
 from json import JSONDecodeError, loads, load, dumps, dump
 from os import environ, path, makedirs
+from typing import AsyncIterator
 
 from dotenv import load_dotenv
 
 from loguru import logger
 
-import openai
+from openai import APIConnectionError, APITimeoutError, AsyncOpenAI, InternalServerError, RateLimitError
+from openai.types.chat import ChatCompletion
 
 from docx import Document
-import tiktoken
 
-load_dotenv()
+from pydantic import ValidationError
 
+from core.ai import consts
+from core.ai.batch import batch_line, read_batch_results
+from core.ai.models import ArticleExtraction, PackedArticle, PackedExtraction
+from core.ai.rate_limit import LLMRateGovernor, provider_retry_after
+from core.ai.response_cache import ResponseCache
+from core.ai.templates import PromptTemplate
+from core.ai.tokens import chunk_text, count_tokens
+from core.crawler.sink import follow_jsonl
 
-class DataCategorizer:
-    openai.api_key = environ.get('OPENAI_API_KEY')
-
-    def count_tokens(self, text, model="gpt-3.5-turbo"):
-        """Estimate the number of tokens in a text using tiktoken."""
-        encoding = tiktoken.get_encoding("cl100k_base")  # Encoding for GPT-3.5 turbo
-        tokens = encoding.encode(text)
-        return len(tokens)
-
-    def split_text_into_chunks(self, text, max_tokens=4096):
-        """Split text into chunks that fit within the token limits."""
-        chunks = []
-        current_chunk = []
-        current_chunk_tokens = 0
-
-        sentences = text.split('. ')
-
-        for sentence in sentences:
-            tokens = self.count_tokens(sentence)
-            if current_chunk_tokens + tokens <= max_tokens:
-                current_chunk.append(sentence)
-                current_chunk_tokens += tokens
-            else:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [sentence]
-                current_chunk_tokens = tokens
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        return chunks
+load_dotenv()
 
-    async def corruption_categorizer(self, text):
-        """Determine if the article is related to corruption."""
-        prompt = (
-            f'Ви отримаєте текст новини українською мовою: {text}. '
-            'Вам потрібно визначити, чи є цей текст пов\'язаний з корупцією. '
-            'Якщо текст пов\'язаний з корупцією, відповідь повинна бути "True". '
-            'Якщо текст не пов\'язаний з корупцією, відповідь повинна бути "False".'
-        )
+SCHEME_TYPES = (
+    "1) **Корупція в сфері оборони**: фіктивні тендери Міноборони, корупція в закупівлях для ЗСУ, фіктивні контракти Міноборони, неякісна техніка для ЗСУ, контрабанда комплектуючих для ЗСУ, непрозорі оборонні контракти, тіньові схеми постачання зброї тощо.\n"
+    "2) **Контрабанда**: схеми на митниці, відкат на митниці, зникнення вантажів на митниці, офшорні схеми імпорту.\n"
+    "3) **Зловживання в державних закупівлях**: тендерні махінації, відкати на держзакупівлях, зловживання при закупівлях, тендерні змови, завищення цін при держзакупівлі.\n"
+    "4) **Незаконна приватизація**: дерибан (або ж розкрадання) державного майна, маніпуляції при оцінці державного майна, заниження вартості об’єктів.\n"
+    "5) **Розкрадання кредитів державних банків**: розкрадання кредитів, виведення кредитних коштів, провалені кредитні програми, фіктивні кредити.\n"
+    "6) **АРМА та державне рейдерство**: виведення активів через АРМА, заниження вартості активів, державне рейдерство.\n"
+    "7) **Антимонопольний комітет України (далі: АМКУ) та перерозподіл ринків**: політичний вплив на керівництво АМКУ, лобіювання інтересів окремих фінансово-промислових груп, формальний характер перевірок зловживань монопольним становищем.\n"
+    "8) **Розкрадання державного майна**: низька прозорість процесів інвентаризації та передачі державного майна, системна корупція серед посадових осіб, відповідальних за облік і збереження майна, виведення держмайна за кордон.\n"
+    "9) **Незаконний видобуток природних ресурсів**: незаконний видобуток та контрабанда природних ресурсів (бурштин, нафти, газу).\n"
+    "10) **Зловживання службовим становищем**: корупція посадовців, виведення коштів через службові рішення, лобізм та зловживання.\n"
+    "11) **Зловживання при розподілі земельних ресурсів**: прихована приватизація землі, корупція та обхід на земельних аукціонах, виведення сільгоспземель під забудову.\n"
+    "12) **Корупція в містобудуванні**: корупція в будівництві, відкати при узгодженні проектів, офшори на будівництві, незаконне будівництво.\n"
+    "13) **Корупція в правоохоронних органах**: фальсифікація справ, хабарі слідчим, правоохоронна мафія, маніпуляції з доказами, корупція в ДБР.\n"
+    "14) **Корупція в судах**: відкати за рішення, легалізація рішень за хабарі, зловживання суддівськими повноваженнями.\n"
+    "15) **Розкрадання гуманітарної та/або військової допомоги**: крадіжка гуманітарної допомоги, маніпулювання наданням допомоги для власної вигоди, продаж на чорному ринку."
+)
+
+CATEGORIZER_PROMPT = PromptTemplate(
+    head='Ви отримаєте текст новини українською мовою: ',
+    tail=(
+        '. Вам потрібно визначити, чи є цей текст пов\'язаний з корупцією. '
+        'Якщо текст пов\'язаний з корупцією, відповідь повинна бути "True". '
+        'Якщо текст не пов\'язаний з корупцією, відповідь повинна бути "False".'
+    ),
+    max_tokens=150
+)
+
+DATA_PROMPT = PromptTemplate(
+    head='Ви отримаєте текст новини українською мовою: ',
+    tail=(
+        ". Будь ласка, екстрагуйте та надайте наступну інформацію у форматі JSON:\n"
+        "1. **Індивідууми**: Перерахуйте всіх осіб, які згадуються, їхні посади та афіліації (якщо є).\n"
+        "2. **Юридичні особи**: Перерахуйте всі компанії або організації в Україні (приватні або державні).\n"
+        "3. **Офшори**: Якщо згадуються офшорні компанії або активи, перерахуйте їх.\n"
+        "4. **Державні органи**: Перерахуйте будь-які залучені державні органи.\n\n"
+        "Формат вихідних даних:\n"
+        "{\n"
+        "  \"individuals\": [\n"
+        "    { \"name\": \"Ім'я особи\", \"position\": \"Посада\", \"affiliations\": [ \"Організація\" ] }\n"
+        "  ],\n"
+        "  \"legal_entities\": [\n"
+        "    { \"entity\": \"Назва організації\", \"type\": \"Державна або приватна\" }\n"
+        "  ],\n"
+        "  \"offshore\": [ \"Офшорна компанія\" ],\n"
+        "  \"government_bodies\": [ \"Державний орган\" ]\n"
+        "}"
+    ),
+    max_tokens=500
+)
+
+SCHEMES_PROMPT = PromptTemplate(
+    head="Ти отримуєш json текст, пов'язаний із різного виду корупцією: ",
+    tail=(
+        ". Будь ласка, витягни з наданого тексту схеми корупції, класифікуючи їх за типами, які наведені в описі. "
+        "Ось приклади можливих типів корупції з описами. Залишіть тільки ті схеми, які точно згадані в тексті. "
+        "Ось види корупції та приклади можливих корупційних схем:\n"
+        f"{SCHEME_TYPES}"
+    ),
+    max_tokens=500
+)
+
+EXTRACTION_PROMPT = PromptTemplate(
+    head='Ви отримаєте текст новини українською мовою: ',
+    tail=(
+        ". Визначте, чи пов'язаний цей текст з корупцією. Якщо так, класифікуйте згадані в ньому схеми корупції "
+        "за наведеними нижче типами, залишивши тільки ті, які точно згадані в тексті, "
+        "та витягніть осіб, юридичних осіб, офшори та державні органи.\n"
+        f"{SCHEME_TYPES}\n"
+        "Відповідь надайте одним JSON-об'єктом за цією JSON-схемою:\n"
+        f"{dumps(ArticleExtraction.model_json_schema(), ensure_ascii=False)}"
+    ),
+    max_tokens=1000,
+    response_format={'type': 'json_object'}
+)
+
+PACKED_PROMPT = PromptTemplate(
+    head='Ви отримаєте кілька текстів новин українською мовою, кожен у тегу <article> зі своїм id:\n',
+    tail=(
+        "Для кожної статті окремо визначте, чи пов'язана вона з корупцією. Якщо так, класифікуйте згадані в ній "
+        "схеми корупції за наведеними нижче типами, залишивши тільки ті, які точно згадані в тексті, "
+        "та витягніть осіб, юридичних осіб, офшори та державні органи.\n"
+        f"{SCHEME_TYPES}\n"
+        "Відповідь надайте одним JSON-об'єктом за цією JSON-схемою, з одним елементом на кожну статтю:\n"
+        f"{dumps(PackedExtraction.model_json_schema(), ensure_ascii=False)}"
+    ),
+    # Per article: a pack of n articles may answer with n times as many tokens, see pack_max_tokens.
+    max_tokens=consts.PACKED_COMPLETION_TOKENS,
+    response_format={'type': 'json_object'}
+)
 
-        chunks = self.split_text_into_chunks(prompt)
 
-        results = []
-        for chunk in chunks:
-            response = openai.ChatCompletion.create(
-                model='gpt-3.5-turbo',
-                messages=[
-                    {'role': 'system', 'content': 'Ви корисний асистент, який визначає корупційний контент.'},
-                    {'role': 'user', 'content': chunk},
-                ],
-                max_tokens=150,
-                temperature=0.5,
-                timeout=6000
+class DataCategorizer:
+    """
+    Categorizes articles with the OpenAI API. Requests go through one AsyncOpenAI client, with at
+    most `concurrency` completions in flight under the RPM/TPM `governor`, and process_json_file
+    works on up to `articles_in_flight` articles at once while writing results in input order.
+    Completions are kept in the on-disk response `cache` unless `use_cache` is False. In `combined`
+    mode an article costs one schema-validated request per chunk instead of a scheme pass and an
+    entity pass, and with `packing` several short articles share one such request.
+    """
+
+    def __init__(
+            self,
+            client: AsyncOpenAI | None = None,
+            concurrency: int = consts.LLM_CONCURRENCY,
+            articles_in_flight: int = consts.ARTICLES_IN_FLIGHT,
+            governor: LLMRateGovernor | None = None,
+            cache: ResponseCache | None = None,
+            use_cache: bool = True,
+            combined: bool = consts.COMBINED_EXTRACTION,
+            packing: bool = consts.PACK_ARTICLES
+    ):
+        self._client: AsyncOpenAI | None = client
+        self.semaphore: Semaphore = Semaphore(concurrency)
+        self.articles_in_flight: int = articles_in_flight
+        self.governor: LLMRateGovernor = governor or LLMRateGovernor()
+        self.cache: ResponseCache | None = (cache or ResponseCache()) if use_cache else None
+        self.combined: bool = combined
+        self.packing: bool = packing and combined
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            # Retries are left to complete(), which coordinates them with the rate governor.
+            self._client = AsyncOpenAI(
+                api_key=environ.get('OPENAI_API_KEY'), timeout=consts.REQUEST_TIMEOUT, max_retries=0
             )
-            result = response['choices'][0]['message']['content'].strip()
-            results.append(result)
+        return self._client
 
+    def estimate_tokens(self, messages: list[dict[str, str]], max_tokens: int) -> int:
+        """Upper bound of the tokens a request uses: its prompt plus the whole completion budget."""
+        prompt_tokens = sum(
+            self.count_tokens(message['content']) + consts.MESSAGE_TOKEN_OVERHEAD for message in messages
+        )
+        return prompt_tokens + consts.REPLY_TOKEN_OVERHEAD + max_tokens
+
+    @staticmethod
+    def request_body(content: str, max_tokens: int, response_format: dict | None = None) -> dict:
+        """Chat completion parameters for `content`, as sent by complete() and written to batch files."""
+        body = {
+            'model': consts.MODEL,
+            'messages': [
+                {'role': 'system', 'content': consts.SYSTEM_PROMPT},
+                {'role': 'user', 'content': content},
+            ],
+            'max_tokens': max_tokens,
+            'temperature': consts.TEMPERATURE,
+        }
+        if response_format:
+            body['response_format'] = response_format
+        return body
+
+    @staticmethod
+    def request_key(body: dict) -> str:
+        return ResponseCache.key(body['model'], body['messages'], body['temperature'], body['max_tokens'])
+
+    async def request(self, body: dict, estimated: int) -> ChatCompletion:
+        """
+        One completion request holding a reservation of `estimated` tokens, settled against the
+        reported usage however the request ends; failed and cancelled requests give it all back.
+        """
+        await self.governor.acquire(estimated)
+        used = 0
+        try:
+            async with self.semaphore:
+                response = await self.client.chat.completions.create(**body)
+            used = response.usage.total_tokens if response.usage else estimated
+            return response
+        finally:
+            self.governor.settle(estimated, used)
+
+    async def complete(self, content: str, max_tokens: int, response_format: dict | None = None) -> str:
+        """
+        One chat completion for `content` under the rate governor and the concurrency cap, answered
+        from the response cache when the same request was made before; only completions the model
+        finished (not cut by max_tokens or the content filter) are cached. Rate limits, server errors
+        and timeouts are retried with jittered backoff, or after the provider's Retry-After, which
+        also pauses every other request.
+        """
+        body = self.request_body(content, max_tokens, response_format)
+        key = self.request_key(body)
+        if self.cache and (cached := self.cache.get(key)) is not None:
+            return cached
+        estimated = self.estimate_tokens(body['messages'], max_tokens)
+        for attempt in range(consts.RETRY_ATTEMPTS):
+            try:
+                response = await self.request(body, estimated)
+            except (RateLimitError, InternalServerError, APITimeoutError, APIConnectionError) as e:
+                if attempt == consts.RETRY_ATTEMPTS - 1:
+                    raise
+                delay = provider_retry_after(getattr(e, 'response', None))
+                if delay is None:
+                    delay = uniform(0, min(consts.RETRY_MAX_DELAY, consts.RETRY_BASE_DELAY * 2 ** attempt))
+                if isinstance(e, RateLimitError):
+                    self.governor.pause(delay)
+                logger.warning(
+                    f'{type(e).__name__}, retrying in {delay:.1f}s (attempt {attempt + 2}/{consts.RETRY_ATTEMPTS}).'
+                )
+                await sleep(delay)
+                continue
+            choice = response.choices[0]
+            completion = (choice.message.content or '').strip()
+            if choice.finish_reason != 'stop':
+                logger.warning(f'Completion stopped by {choice.finish_reason}, not caching it.')
+            elif self.cache:
+                try:
+                    self.cache.put(key, completion)
+                except sqlite3.Error as e:
+                    logger.warning(f'Cannot cache completion: {e}')
+            return completion
+
+    def forget(self, content: str, max_tokens: int, response_format: dict | None = None) -> None:
+        """Drop the cached completion of a request whose answer was rejected, so it is asked again next time."""
+        if self.cache:
+            try:
+                self.cache.delete(self.request_key(self.request_body(content, max_tokens, response_format)))
+            except sqlite3.Error as e:
+                logger.warning(f'Cannot drop cached completion: {e}')
+
+    @staticmethod
+    def count_tokens(text, model=consts.MODEL):
+        """Number of tokens in a text, with the model's cached tiktoken encoder."""
+        return count_tokens(text, model)
+
+    @staticmethod
+    def split_text_into_chunks(text, max_tokens=consts.CHUNK_MAX_TOKENS, overlap=0):
+        """Split text into chunks that fit within the token limits, cutting at sentence ends."""
+        return chunk_text(text, max_tokens, overlap)
+
+    async def complete_prompts(self, template: PromptTemplate, article: str, return_exceptions: bool = False) -> list:
+        """Completions of the template's prompts for every chunk of the article, in chunk order."""
+        return await gather(
+            *(
+                self.complete(prompt, template.max_tokens, template.response_format)
+                for prompt in template.prompts(article)
+            ),
+            return_exceptions=return_exceptions
+        )
+
+    async def corruption_categorizer(self, text):
+        """Determine if the article is related to corruption."""
+        results = await self.complete_prompts(CATEGORIZER_PROMPT, text)
         return "True" if "True" in results else "False"
 
     async def corruption_data_only(self, text):
         """Extract detailed corruption-related data from the article."""
-        prompt = (
-            f"Ви отримаєте текст новини українською мовою: {text}. "
-            "Будь ласка, екстрагуйте та надайте наступну інформацію у форматі JSON:\n"
-            "1. **Індивідууми**: Перерахуйте всіх осіб, які згадуються, їхні посади та афіліації (якщо є).\n"
-            "2. **Юридичні особи**: Перерахуйте всі компанії або організації в Україні (приватні або державні).\n"
-            "3. **Офшори**: Якщо згадуються офшорні компанії або активи, перерахуйте їх.\n"
-            "4. **Державні органи**: Перерахуйте будь-які залучені державні органи.\n\n"
-            "Формат вихідних даних:\n"
-            "{\n"
-            "  \"individuals\": [\n"
-            "    { \"name\": \"Ім'я особи\", \"position\": \"Посада\", \"affiliations\": [ \"Організація\" ] }\n"
-            "  ],\n"
-            "  \"legal_entities\": [\n"
-            "    { \"entity\": \"Назва організації\", \"type\": \"Державна або приватна\" }\n"
-            "  ],\n"
-            "  \"offshore\": [ \"Офшорна компанія\" ],\n"
-            "  \"government_bodies\": [ \"Державний орган\" ]\n"
-            "}"
-        )
-
-        chunks = self.split_text_into_chunks(prompt)
-
         results: list[dict[str, str]] = []
-        for chunk in chunks:
-            response = openai.ChatCompletion.create(
-                model='gpt-3.5-turbo',
-                messages=[
-                    {'role': 'system', 'content': 'Ви корисний асистент, який визначає корупційний контент.'},
-                    {'role': 'user', 'content': chunk},
-                ],
-                max_tokens=500,
-                temperature=0.5,
-                timeout=6000
-            )
-            result = response['choices'][0]['message']['content'].strip()
+        for result in await self.complete_prompts(DATA_PROMPT, text):
             try:
                 corruption_data = loads(result)
                 results.append(corruption_data)
@@ -117,43 +286,13 @@ class DataCategorizer:
         return results
 
     async def corruption_schemes(self, file_data):
-        prompt = (
-            f"Ти отримуєш json текст, пов'язаний із різного виду корупцією: {file_data}. "
-            "Будь ласка, витягни з наданого тексту схеми корупції, класифікуючи їх за типами, які наведені в описі. "
-            "Ось приклади можливих типів корупції з описами. Залишіть тільки ті схеми, які точно згадані в тексті. "
-            "Ось види корупції та приклади можливих корупційних схем:\n"
-            "1) **Корупція в сфері оборони**: фіктивні тендери Міноборони, корупція в закупівлях для ЗСУ, фіктивні контракти Міноборони, неякісна техніка для ЗСУ, контрабанда комплектуючих для ЗСУ, непрозорі оборонні контракти, тіньові схеми постачання зброї тощо.\n"
-            "2) **Контрабанда**: схеми на митниці, відкат на митниці, зникнення вантажів на митниці, офшорні схеми імпорту.\n"
-            "3) **Зловживання в державних закупівлях**: тендерні махінації, відкати на держзакупівлях, зловживання при закупівлях, тендерні змови, завищення цін при держзакупівлі.\n"
-            "4) **Незаконна приватизація**: дерибан (або ж розкрадання) державного майна, маніпуляції при оцінці державного майна, заниження вартості об’єктів.\n"
-            "5) **Розкрадання кредитів державних банків**: розкрадання кредитів, виведення кредитних коштів, провалені кредитні програми, фіктивні кредити.\n"
-            "6) **АРМА та державне рейдерство**: виведення активів через АРМА, заниження вартості активів, державне рейдерство.\n"
-            "7) **Антимонопольний комітет України (далі: АМКУ) та перерозподіл ринків**: політичний вплив на керівництво АМКУ, лобіювання інтересів окремих фінансово-промислових груп, формальний характер перевірок зловживань монопольним становищем.\n"
-            "8) **Розкрадання державного майна**: низька прозорість процесів інвентаризації та передачі державного майна, системна корупція серед посадових осіб, відповідальних за облік і збереження майна, виведення держмайна за кордон.\n"
-            "9) **Незаконний видобуток природних ресурсів**: незаконний видобуток та контрабанда природних ресурсів (бурштин, нафти, газу).\n"
-            "10) **Зловживання службовим становищем**: корупція посадовців, виведення коштів через службові рішення, лобізм та зловживання.\n"
-            "11) **Зловживання при розподілі земельних ресурсів**: прихована приватизація землі, корупція та обхід на земельних аукціонах, виведення сільгоспземель під забудову.\n"
-            "12) **Корупція в містобудуванні**: корупція в будівництві, відкати при узгодженні проектів, офшори на будівництві, незаконне будівництво.\n"
-            "13) **Корупція в правоохоронних органах**: фальсифікація справ, хабарі слідчим, правоохоронна мафія, маніпуляції з доказами, корупція в ДБР.\n"
-            "14) **Корупція в судах**: відкати за рішення, легалізація рішень за хабарі, зловживання суддівськими повноваженнями.\n"
-            "15) **Розкрадання гуманітарної та/або військової допомоги**: крадіжка гуманітарної допомоги, маніпулювання наданням допомоги для власної вигоди, продаж на чорному ринку."
-        )
-        chunks = self.split_text_into_chunks(prompt)
         results = []
 
-        for chunk in chunks:
+        responses = await self.complete_prompts(SCHEMES_PROMPT, file_data, return_exceptions=True)
+        for result in responses:
             try:
-                response = openai.ChatCompletion.create(
-                    model='gpt-3.5-turbo',
-                    messages=[
-                        {'role': 'system', 'content': 'Ви корисний асистент, який визначає корупційний контент.'},
-                        {'role': 'user', 'content': chunk},
-                    ],
-                    max_tokens=500,
-                    temperature=0.5,
-                    timeout=6000
-                )
-                result = response['choices'][0]['message']['content'].strip()
+                if isinstance(result, Exception):
+                    raise result
                 corruption_schemes = []
                 for line in result.split("\n"):
                     if line.strip():
@@ -171,78 +310,306 @@ class DataCategorizer:
                 results.append({"error": f"Error processing chunk: {str(e)}"})
         return results
 
-    async def process_json_file(self, input_file_path, output_file_path_json, output_file_path_docx):
+    async def extract(self, text) -> list[ArticleExtraction]:
+        """Corruption flag, schemes and entities of every chunk of the article, skipping failed or invalid answers."""
+        extractions = []
+        prompts = EXTRACTION_PROMPT.prompts(text)
+        results = await gather(
+            *(
+                self.complete(prompt, EXTRACTION_PROMPT.max_tokens, EXTRACTION_PROMPT.response_format)
+                for prompt in prompts
+            ),
+            return_exceptions=True
+        )
+        for prompt, result in zip(prompts, results):
+            if isinstance(result, Exception):
+                logger.warning(f'Skipping a chunk whose extraction failed: {result}')
+                continue
+            try:
+                extractions.append(ArticleExtraction.model_validate_json(result))
+            except ValidationError as e:
+                logger.warning(f'Skipping an extraction that does not match the schema: {e.error_count()} errors.')
+                self.forget(prompt, EXTRACTION_PROMPT.max_tokens, EXTRACTION_PROMPT.response_format)
+        return extractions
+
+    @staticmethod
+    async def read_articles(input_file_path) -> AsyncIterator[dict]:
+        """Yield input articles. A .jsonl file may still be written by a crawler's sink and is followed to its end."""
+        if input_file_path.endswith('.jsonl'):
+            async for article in follow_jsonl(input_file_path):
+                yield article
+            return
         with open(input_file_path, 'r', encoding='utf-8') as file:
             data = load(file)
-
-        if isinstance(data, list) and len(data) > 0:
-            results = []
-            doc = Document()
-            doc.add_heading('Corruption Data Report', 0)
-
+        if isinstance(data, list):
             for article in data:
-                text = article.get("short_text", "")
-                link = article.get("link", "Не надано")
-                logger.info(f"Extracted link: {link}")
-
-                article_info = {
-                    "date": article.get("date", "Не надано"),
-                    "link": link,
-                    "title": article.get("title", "Не надано"),
-                    "author": article.get("author", "Не надано"),
-                    "short_text": text
-                }
-
-                # Step 1: Check if the article is related to corruption by checking the entire article text
-                corruption_schemes = await self.corruption_schemes(text)
-
-                if corruption_schemes:  # Only proceed if corruption schemes are found
-                    # Flatten the nested corruption_schemes to avoid redundancy
-                    flat_corruption_schemes = []
-                    seen_types = set()  # To track types and avoid duplicates
-
-                    for scheme_group in corruption_schemes:
-                        for scheme in scheme_group.get("corruption_schemes", []):
-                            if scheme["type"] not in seen_types:
-                                flat_corruption_schemes.append(scheme)
-                                seen_types.add(scheme["type"])
-
-                    # Add the unique corruption schemes to the article info
-                    article_info["corruption_schemes"] = flat_corruption_schemes
-
-                    # Step 2: Split the article text into chunks if it's too long
-                    chunks = self.split_text_into_chunks(text)
-
-                    combined_extracted_data = []
-                    for chunk in chunks:
-                        # Extract the corruption-related data from the chunk
-                        extracted_data = await self.corruption_data_only(chunk)
-                        if not extracted_data:
-                            combined_extracted_data.append({"message": "No corruption-related data found."})
-                        else:
-                            combined_extracted_data.extend(extracted_data)
-
-                    # Add extracted corruption data to the article
-                    article_info["corruption_data"] = combined_extracted_data
-
-                    # Append the article with corruption data to the results
-                    results.append(article_info)
-
-                    # Add the article data to the DOCX file
-                    doc.add_heading(article_info["title"], level=1)
-                    doc.add_paragraph(f"Date: {article_info['date']}")
-                    doc.add_paragraph(f"Link: {article_info['link']}")
-                    doc.add_paragraph(f"Author: {article_info['author']}")
-                    doc.add_paragraph(f"Short Text: {article_info['short_text']}")
-
-                    # Add corruption schemes in the DOCX file
-                    for scheme in flat_corruption_schemes:
-                        doc.add_paragraph(f"Corruption Type: {scheme['type']}")
-                        doc.add_paragraph(f"Message: {scheme['message']}")
-
-            # Step 3: Write the results to the output JSON file
-            with open(output_file_path_json, 'w', encoding='utf-8') as json_file:
-                dump(results, json_file, ensure_ascii=False, indent=4)
-
-            # Step 4: Save the DOCX file
-            doc.save(output_file_path_docx)
+                yield article
+
+    async def process_article(self, article, extractions=None):
+        """
+        Categorize one article; returns its enriched info, or None when no corruption scheme is found.
+        `extractions` are combined answers already obtained for the article, e.g. from a packed request.
+        """
+        text = article.get("short_text", "")
+        link = article.get("link", "Не надано")
+        logger.info(f"Extracted link: {link}")
+
+        article_info = {
+            "date": article.get("date", "Не надано"),
+            "link": link,
+            "title": article.get("title", "Не надано"),
+            "author": article.get("author", "Не надано"),
+            "short_text": text
+        }
+
+        # Step 1: Check if the article is related to corruption by checking the entire article text
+        if self.combined or extractions is not None:
+            if extractions is None:
+                extractions = await self.extract(text)
+            extractions = [extraction for extraction in extractions if extraction.is_corruption_present]
+            corruption_schemes = [
+                {"corruption_schemes": [scheme.model_dump() for scheme in extraction.corruption_schemes]}
+                for extraction in extractions if extraction.corruption_schemes
+            ]
+        else:
+            corruption_schemes = await self.corruption_schemes(text)
+
+        if not corruption_schemes:  # Only proceed if corruption schemes are found
+            return
+
+        # Flatten the nested corruption_schemes to avoid redundancy
+        flat_corruption_schemes = []
+        seen_types = set()  # To track types and avoid duplicates
+
+        for scheme_group in corruption_schemes:
+            for scheme in scheme_group.get("corruption_schemes", []):
+                if scheme["type"] not in seen_types:
+                    flat_corruption_schemes.append(scheme)
+                    seen_types.add(scheme["type"])
+
+        # Add the unique corruption schemes to the article info
+        article_info["corruption_schemes"] = flat_corruption_schemes
+
+        # Step 2: Extract the data; the combined extraction already holds it, otherwise it is a second pass
+        if self.combined or extractions is not None:
+            combined_extracted_data = [extraction.entities.model_dump() for extraction in extractions]
+        else:
+            combined_extracted_data = await self.corruption_data_only(text) or [
+                {"message": "No corruption-related data found."}
+            ]
+
+        # Add extracted corruption data to the article
+        article_info["corruption_data"] = combined_extracted_data
+        return article_info
+
+    async def process_articles(self, articles: AsyncIterator[dict]) -> AsyncIterator[dict | None]:
+        """
+        Process up to `articles_in_flight` articles, or packs of articles, at once, yielding each
+        result (None for articles without corruption) in input order.
+        """
+        in_flight: deque[Task] = deque()
+        try:
+            async for group in self.group_articles(articles):
+                in_flight.append(create_task(self.process_group(group)))
+                if len(in_flight) >= self.articles_in_flight:
+                    for result in await in_flight.popleft():
+                        yield result
+            while in_flight:
+                for result in await in_flight.popleft():
+                    yield result
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def group_articles(self, articles: AsyncIterator[dict]) -> AsyncIterator[list[dict]]:
+        """
+        Consecutive articles packed into one request while they and the completion room of every
+        article after the first fit into the packed prompt's budget (next-fit, so results keep the
+        input order); an article taking more than half of the budget, or every article when packing
+        is off, is a group of its own.
+        """
+        pack: list[dict] = []
+        pack_tokens = 0
+        async for article in articles:
+            if not self.packing:
+                yield [article]
+                continue
+            tokens = count_tokens(self.pack_entry(len(pack), article))
+            if tokens > PACKED_PROMPT.article_budget // 2:
+                # The pack so far goes first, so results stay in input order.
+                if pack:
+                    yield pack
+                    pack, pack_tokens = [], 0
+                yield [article]
+                continue
+            if pack and (
+                    pack_tokens + tokens + PACKED_PROMPT.max_tokens * len(pack) > PACKED_PROMPT.article_budget
+                    or len(pack) == consts.PACK_MAX_ARTICLES
+            ):
+                yield pack
+                pack, pack_tokens = [], 0
+                tokens = count_tokens(self.pack_entry(0, article))
+            pack.append(article)
+            pack_tokens += tokens
+        if pack:
+            yield pack
+
+    async def process_group(self, articles: list[dict]) -> list[dict | None]:
+        if len(articles) == 1:
+            return [await self.process_article(articles[0])]
+        return await self.process_pack(articles)
+
+    @staticmethod
+    def pack_entry(index: int, article: dict) -> str:
+        return f'<article id="{index}">\n{article.get("short_text", "").strip()}\n</article>\n'
+
+    @staticmethod
+    def pack_max_tokens(articles: list[dict]) -> int:
+        """Completion budget of a pack: as much room for every article as the packed prompt gives one."""
+        return PACKED_PROMPT.max_tokens * len(articles)
+
+    def pack_prompt(self, articles: list[dict]) -> str:
+        return PACKED_PROMPT.render(''.join(self.pack_entry(i, article) for i, article in enumerate(articles)))
+
+    async def process_pack(self, articles: list[dict]) -> list[dict | None]:
+        """
+        Categorize several short articles with one request. Every article whose answer is missing or
+        fails validation, or all of them when the request fails, is categorized again on its own; such
+        an answer is not kept in the response cache.
+        """
+        prompt = self.pack_prompt(articles)
+        max_tokens = self.pack_max_tokens(articles)
+        try:
+            answer = await self.complete(prompt, max_tokens, PACKED_PROMPT.response_format)
+        except Exception as e:
+            logger.warning(f'Packed request of {len(articles)} articles failed: {e}')
+            answer = ''
+        extractions: dict[str, ArticleExtraction] = {}
+        try:
+            items = loads(answer).get('articles', [])
+        except (JSONDecodeError, AttributeError):
+            items = []
+        for item in items if isinstance(items, list) else []:
+            try:
+                packed = PackedArticle.model_validate(item)
+            except ValidationError:
+                continue
+            extractions[packed.id] = packed
+        if missing := len(articles) - len(extractions.keys() & set(map(str, range(len(articles))))):
+            logger.warning(f'{missing} of {len(articles)} packed articles without a valid answer, sending them alone.')
+            self.forget(prompt, max_tokens, PACKED_PROMPT.response_format)
+        return list(await gather(*(
+            self.process_article(article, [extractions[str(i)]] if str(i) in extractions else None)
+            for i, article in enumerate(articles)
+        )))
+
+    async def process_json_file(self, input_file_path, output_file_path_json, output_file_path_docx):
+        results = []
+        doc = Document()
+        doc.add_heading('Corruption Data Report', 0)
+        articles_read = 0
+
+        async for article_info in self.process_articles(self.read_articles(input_file_path)):
+            articles_read += 1
+            if not article_info:
+                continue
+
+            # Append the article with corruption data to the results
+            results.append(article_info)
+
+            # Add the article data to the DOCX file
+            doc.add_heading(article_info["title"], level=1)
+            doc.add_paragraph(f"Date: {article_info['date']}")
+            doc.add_paragraph(f"Link: {article_info['link']}")
+            doc.add_paragraph(f"Author: {article_info['author']}")
+            doc.add_paragraph(f"Short Text: {article_info['short_text']}")
+
+            # Add corruption schemes in the DOCX file
+            for scheme in article_info["corruption_schemes"]:
+                doc.add_paragraph(f"Corruption Type: {scheme['type']}")
+                doc.add_paragraph(f"Message: {scheme['message']}")
+
+        if self.cache:
+            logger.info(f'LLM response cache: {self.cache.summary()}')
+        if not articles_read:
+            return
+
+        # Step 3: Write the results to the output JSON file
+        with open(output_file_path_json, 'w', encoding='utf-8') as json_file:
+            dump(results, json_file, ensure_ascii=False, indent=4)
+
+        # Step 4: Save the DOCX file
+        doc.save(output_file_path_docx)
+
+    async def batch_requests(self, articles: AsyncIterator[dict]) -> AsyncIterator[dict]:
+        """The request bodies process_articles sends first for the articles, in the same grouping and chunking."""
+        async for group in self.group_articles(articles):
+            if len(group) > 1:
+                yield self.request_body(
+                    self.pack_prompt(group), self.pack_max_tokens(group), PACKED_PROMPT.response_format
+                )
+                continue
+            text = group[0].get("short_text", "")
+            for template in (EXTRACTION_PROMPT,) if self.combined else (SCHEMES_PROMPT, DATA_PROMPT):
+                for prompt in template.prompts(text):
+                    yield self.request_body(prompt, template.max_tokens, template.response_format)
+
+    async def build_batch(self, input_file_path, batch_file_path) -> int:
+        """
+        Write the requests for the input articles as a provider batch-job JSONL and return their number.
+        Custom ids are the requests' cache keys, so they are stable across runs; requests the response
+        cache already answers, and repeated ones, are left out.
+        """
+        written = 0
+        seen = set()
+        with open(batch_file_path, 'w', encoding='utf-8') as file:
+            async for body in self.batch_requests(self.read_articles(input_file_path)):
+                key = self.request_key(body)
+                if key in seen or (self.cache and self.cache.get(key) is not None):
+                    continue
+                seen.add(key)
+                file.write(dumps(batch_line(key, body), ensure_ascii=False) + '\n')
+                written += 1
+        logger.info(f'{written} requests written to {batch_file_path}.')
+        return written
+
+    async def submit_batch(self, batch_file_path) -> str:
+        """Upload a batch file and start the batch job; returns the job id."""
+        with open(batch_file_path, 'rb') as file:
+            uploaded = await self.client.files.create(file=file, purpose='batch')
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id, endpoint=consts.BATCH_ENDPOINT, completion_window=consts.BATCH_COMPLETION_WINDOW
+        )
+        logger.info(f'Batch job {batch.id} submitted.')
+        return batch.id
+
+    async def download_batch(self, batch_id, results_file_path, poll_interval=consts.BATCH_POLL_INTERVAL) -> bool:
+        """
+        Wait until the batch job is over and save its output file. Returns whether the job completed;
+        an expired job may still have answered part of the requests, which are saved as well.
+        """
+        while (batch := await self.client.batches.retrieve(batch_id)).status not in consts.BATCH_FINAL_STATUSES:
+            await sleep(poll_interval)
+        if not batch.output_file_id:
+            logger.error(f'Batch job {batch_id} is {batch.status} without results.')
+            return False
+        content = await self.client.files.content(batch.output_file_id)
+        with open(results_file_path, 'wb') as file:
+            file.write(content.content)
+        logger.info(f'Batch job {batch_id} is {batch.status}, results saved to {results_file_path}.')
+        return batch.status == 'completed'
+
+    async def ingest_batch(self, results_file_path, input_file_path, output_file_path_json, output_file_path_docx):
+        """
+        Produce the outputs of process_json_file from a batch job's results: the completions go into
+        the response cache, which then answers process_json_file. Only requests the batch did not
+        answer, failed ones or single-article retries of invalid packed answers, are sent live.
+        """
+        if self.cache is None:
+            self.cache = ResponseCache(':memory:')
+        stored = 0
+        for key, completion in read_batch_results(results_file_path):
+            self.cache.put(key, completion)
+            stored += 1
+        logger.info(f'{stored} batch completions stored.')
+        await self.process_json_file(input_file_path, output_file_path_json, output_file_path_docx)
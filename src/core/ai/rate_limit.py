@@ -0,0 +1,80 @@
+from asyncio import Lock, sleep
+from time import monotonic
+
+from httpx import Response
+
+from core.ai import consts
+from core.http_utils import retry_after
+
+
+class TokenBucket:
+    """Continuously refilling bucket that holds at most one minute's worth of `per_minute` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity: float = per_minute
+        self.rate: float = per_minute / 60
+        self.available: float = per_minute
+        self.updated: float = monotonic()
+
+    def refill(self) -> None:
+        now: float = monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available; requests above capacity only wait for a full bucket."""
+        self.refill()
+        return max(min(amount, self.capacity) - self.available, 0.0) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.refill()
+        self.available -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        """Return over-reserved units; a negative amount charges units that were under-reserved."""
+        self.refill()
+        self.available = min(self.capacity, self.available + amount)
+
+
+class LLMRateGovernor:
+    """
+    Keeps LLM traffic under the provider's requests- and tokens-per-minute limits. Every request
+    reserves its estimated tokens and waits, in arrival order, until both buckets can cover it; the
+    reservation is settled against the reported usage afterwards. A Retry-After from the provider
+    pauses all callers until it expires, so throughput settles just under the limit.
+    """
+
+    def __init__(self, rpm: float = consts.RPM_LIMIT, tpm: float = consts.TPM_LIMIT):
+        self.requests: TokenBucket = TokenBucket(rpm)
+        self.tokens: TokenBucket = TokenBucket(tpm)
+        self.lock: Lock = Lock()
+        self.resume_at: float = 0.0
+        self.waited: float = 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        async with self.lock:
+            while (delay := max(
+                    self.resume_at - monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens)
+            )) > 0:
+                self.waited += delay
+                await sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+
+    def settle(self, estimated_tokens: int, used_tokens: int) -> None:
+        self.tokens.give_back(estimated_tokens - used_tokens)
+
+    def pause(self, seconds: float) -> None:
+        self.resume_at = max(self.resume_at, monotonic() + seconds)
+
+
+def provider_retry_after(response: Response | None) -> float | None:
+    """Delay asked for by the provider, preferring OpenAI's millisecond header."""
+    if response is None:
+        return
+    try:
+        return max(float(response.headers['retry-after-ms']) / 1000, 0.0)
+    except (KeyError, ValueError):
+        return retry_after(response)
@@ -0,0 +1,95 @@
+import sqlite3
+from hashlib import sha256
+from json import dumps
+from time import time
+from typing import Any
+
+from core.ai import consts
+
+
+class ResponseCache:
+    """
+    On-disk store of completions keyed by a hash of the request, so re-running the categorizer on an
+    overlapping input answers unchanged prompts locally. Entries expire after `ttl` seconds (never
+    when None) and the least recently used go first once the cache outgrows `max_bytes`.
+    """
+
+    def __init__(
+            self,
+            path: str = consts.RESPONSE_CACHE_PATH,
+            max_bytes: int = consts.RESPONSE_CACHE_MAX_BYTES,
+            ttl: float | None = consts.RESPONSE_CACHE_TTL
+    ):
+        self.max_bytes: int = max_bytes
+        self.ttl: float | None = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        # WAL keeps the per-hit access-time update cheap enough to answer in microseconds.
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS completions ('
+            'key TEXT PRIMARY KEY, content TEXT, size INTEGER, created REAL, last_access REAL)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS completions_last_access ON completions (last_access)')
+        self.connection.commit()
+
+    @staticmethod
+    def key(model: str, messages: list[dict[str, str]], temperature: float, max_tokens: int) -> str:
+        request: dict[str, Any] = {
+            'model': model, 'messages': messages, 'temperature': temperature, 'max_tokens': max_tokens
+        }
+        return sha256(dumps(request, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        row = self.connection.execute('SELECT content, created FROM completions WHERE key = ?', (key,)).fetchone()
+        if not row or self.expired(row[1]):
+            self.misses += 1
+            return
+        self.hits += 1
+        self.connection.execute('UPDATE completions SET last_access = ? WHERE key = ?', (time(), key))
+        self.connection.commit()
+        return row[0]
+
+    def put(self, key: str, content: str) -> None:
+        now: float = time()
+        self.connection.execute(
+            'INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)',
+            (key, content, len(content.encode('utf-8')), now, now)
+        )
+        self.evict()
+        self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        self.connection.execute('DELETE FROM completions WHERE key = ?', (key,))
+        self.connection.commit()
+
+    def expired(self, created: float) -> bool:
+        return self.ttl is not None and created < time() - self.ttl
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently used ones until the cache fits into `max_bytes`."""
+        if self.ttl is not None:
+            self.connection.execute('DELETE FROM completions WHERE created < ?', (time() - self.ttl,))
+        total: int = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM completions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.connection.execute(
+                'SELECT key, size FROM completions ORDER BY last_access'
+        ).fetchall():
+            self.connection.execute('DELETE FROM completions WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def summary(self) -> dict[str, Any]:
+        lookups: int = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        self.connection.close()
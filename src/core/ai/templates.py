@@ -0,0 +1,52 @@
+from functools import cached_property
+
+from core.ai import consts
+from core.ai.tokens import chunk_text, count_tokens
+
+
+class PromptTemplate:
+    """
+    Instructions around a slot for the article. Only the article is chunked: every request repeats
+    the whole instruction block, and the article gets what is left of the request budget, the
+    smaller of the model's context window and REQUEST_MAX_TOKENS, after the instructions, the system
+    prompt and the completion.
+    """
+
+    def __init__(
+            self,
+            head: str,
+            tail: str,
+            max_tokens: int,
+            model: str = consts.MODEL,
+            response_format: dict | None = None
+    ):
+        """`response_format` is passed on to the API, e.g. {'type': 'json_object'} for JSON mode."""
+        self.head: str = head
+        self.tail: str = tail
+        self.max_tokens: int = max_tokens
+        self.model: str = model
+        self.response_format: dict | None = response_format
+
+    @cached_property
+    def article_budget(self) -> int:
+        request_limit: int = min(
+            consts.CONTEXT_WINDOWS.get(self.model, consts.DEFAULT_CONTEXT_WINDOW), consts.REQUEST_MAX_TOKENS
+        )
+        fixed: int = (
+            count_tokens(consts.SYSTEM_PROMPT, self.model)
+            + count_tokens(self.head, self.model)
+            + count_tokens(self.tail, self.model)
+            + 2 * consts.MESSAGE_TOKEN_OVERHEAD
+            + consts.REPLY_TOKEN_OVERHEAD
+            + consts.JOIN_TOKEN_MARGIN
+        )
+        if (budget := request_limit - fixed - self.max_tokens) <= 0:
+            raise ValueError(f'Instructions of {fixed} tokens leave no room for the article within {request_limit}.')
+        return budget
+
+    def render(self, article: str) -> str:
+        return f'{self.head}{article.strip()}{self.tail}'
+
+    def prompts(self, article: str) -> list[str]:
+        """One prompt per chunk of the article, each within the request budget."""
+        return [self.render(chunk) for chunk in chunk_text(article, self.article_budget, model=self.model)]
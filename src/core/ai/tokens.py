@@ -0,0 +1,126 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+from os import cpu_count
+from re import Pattern, compile as compile_pattern
+from typing import Final
+
+import tiktoken
+
+from core.ai import consts
+
+# Sentence ends and line breaks in UTF-8 text, matched on bytes so they line up with token byte offsets.
+SENTENCE_END: Final[Pattern] = compile_pattern(rb'(?:[.!?]|\xe2\x80\xa6)(?=\s)|\n')
+
+# Tokens of the latest texts: a prompt is encoded when it is chunked and again when its request is paced.
+ENCODED: Final[OrderedDict[tuple[str, str], list[int]]] = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str = consts.MODEL) -> tiktoken.Encoding:
+    """The model's tiktoken encoding, loaded once per model; unknown models fall back to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(consts.FALLBACK_ENCODING)
+
+
+@lru_cache(maxsize=None)
+def token_lengths(model: str) -> list[int]:
+    """Byte length of every token of the model's vocabulary, to turn token positions into text offsets."""
+    encoder: tiktoken.Encoding = get_encoder(model)
+    lengths: list[int] = []
+    for token in range(encoder.n_vocab):
+        try:
+            lengths.append(len(encoder.decode_single_token_bytes(token)))
+        except KeyError:
+            lengths.append(0)
+    return lengths
+
+
+def encode(text: str, model: str = consts.MODEL) -> list[int]:
+    """Tokens of `text`, remembered for the latest texts; the list is shared and must not be modified."""
+    if (key := (text, model)) in ENCODED:
+        ENCODED.move_to_end(key)
+        return ENCODED[key]
+    tokens: list[int] = get_encoder(model).encode_ordinary(text)
+    remember(text, model, tokens)
+    return tokens
+
+
+def remember(text: str, model: str, tokens: list[int]) -> None:
+    ENCODED[text, model] = tokens
+    if len(ENCODED) > consts.ENCODED_TEXTS_CACHED:
+        ENCODED.popitem(last=False)
+
+
+def count_tokens(text: str, model: str = consts.MODEL) -> int:
+    return len(encode(text, model))
+
+
+def encode_batch(texts: list[str], model: str = consts.MODEL) -> list[list[int]]:
+    """Encode many texts at once, on tiktoken's native thread pool when there is more than one CPU."""
+    encoder: tiktoken.Encoding = get_encoder(model)
+    if (threads := min(consts.ENCODE_THREADS, cpu_count() or 1)) > 1:
+        return encoder.encode_ordinary_batch(texts, num_threads=threads)
+    return [encoder.encode_ordinary(text) for text in texts]
+
+
+def count_tokens_batch(texts: list[str], model: str = consts.MODEL) -> list[int]:
+    return [len(tokens) for tokens in encode_batch(texts, model)]
+
+
+def chunk_text(text: str, max_tokens: int, overlap: int = 0, model: str = consts.MODEL) -> list[str]:
+    """
+    Split `text` into chunks of at most `max_tokens` tokens. The text is encoded once and its token
+    array sliced at the last sentence end that fits, or at a word boundary if a sentence is longer
+    than a chunk; consecutive chunks repeat up to `overlap` tokens of whole sentences. The tokens of
+    every chunk are remembered, so counting a chunk afterwards does not encode it again.
+    """
+    if len(tokens := encode(text, model)) <= max_tokens:
+        return [text] if text.strip() else []
+    return slice_tokens(text, tokens, max_tokens, overlap, model)
+
+
+def chunk_texts(texts: list[str], max_tokens: int, overlap: int = 0, model: str = consts.MODEL) -> list[list[str]]:
+    """chunk_text for many texts, e.g. all articles of a file, encoded in a single batch."""
+    return [
+        slice_tokens(text, tokens, max_tokens, overlap, model) if len(tokens) > max_tokens
+        else [text] if text.strip() else []
+        for text, tokens in zip(texts, encode_batch(texts, model))
+    ]
+
+
+def slice_tokens(text: str, tokens: list[int], max_tokens: int, overlap: int, model: str) -> list[str]:
+    data: bytes = text.encode('utf-8')
+    # Byte offset where each token prefix ends, and the longest token prefix up to each sentence end.
+    offsets: list[int] = [0, *accumulate(map(token_lengths(model).__getitem__, tokens))]
+    cuts: list[int] = sorted({0, *(bisect_right(offsets, match.end()) - 1 for match in SENTENCE_END.finditer(data))})
+    chunks: list[str] = []
+    start: int = 0
+    previous_end: int = 0
+    while start < len(tokens):
+        end: int = len(tokens)
+        if end - start > max_tokens:
+            sentence_end: int = cuts[bisect_right(cuts, start + max_tokens) - 1]
+            end = sentence_end if sentence_end > max(start, previous_end) else word_end(data, offsets, start, max_tokens)
+        # Not stripped: dropping the space a word's token starts with can take more tokens than the slice.
+        if (chunk := data[offsets[start]:offsets[end]].decode('utf-8', errors='ignore')).strip():
+            chunks.append(chunk)
+            remember(chunk, model, tokens[start:end])
+        if end == len(tokens):
+            break
+        previous_end = end
+        # The next chunk starts at the first sentence within `overlap` tokens of the end, or at the end.
+        resume: int = bisect_right(cuts, end - overlap - 1) if overlap else len(cuts)
+        start = cuts[resume] if resume < len(cuts) and start < cuts[resume] < end else end
+    return chunks
+
+
+def word_end(data: bytes, offsets: list[int], start: int, max_tokens: int) -> int:
+    """End of the longest run of whole words after `start` within `max_tokens`, so the slice encodes back the same."""
+    for end in range(start + max_tokens, start, -1):
+        if data[offsets[end]:offsets[end] + 1].isspace():
+            return end
+    return start + max_tokens
@@ -1,7 +1,10 @@
-from typing import Final
+from typing import Any, Final
 
 URL: Final[str] = 'https://bihus.info/novyny/'
 OUTPUT_FILE: Final[str] = 'bihus_news_data.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://bihus.info/robots.txt', 'https://bihus.info/feed/')
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://bihus\.info/[^/]+/$'
 
 LINKS: Final[list[str]] = [
     'https://bihus.info/nazk-pereviryaye-sposib-zhyttya-nardepa-gerasymova-pislya-syuzhetu-bihus-info/',
@@ -100,3 +103,11 @@ LINKS: Final[list[str]] = [
     'https://bihus.info/nardep-kisilov-pidtverdyv-shho-zhyve-v-kvartyri-teshhi-za-kilka-miljoniv-dolariv/',
     'https://bihus.info/zhurnalisty-bihus-info-finalno-vygraly-sud-u-gladkovskogo-u-spravi-rozsliduvannya-pro-oboronku/'
 ]
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'time', 'class': 'bi-intro-post__time bi-single__meta-item'},
+    'title': {'tag': 'h1', 'class': 'bi-single__title'},
+    'author': {'value': 'Not given'},
+    'short_text': {'tag': 'div', 'class': 'bi-single-content', 'inner': ('h4', 'p'), 'count': 5, 'default': 'No Text'},
+}
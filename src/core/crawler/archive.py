@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from gzip import compress, decompress
+from os import makedirs, path
+from typing import Any, BinaryIO, Iterator, TextIO
+from uuid import uuid4
+
+from core.crawler.extractor import SelectorExtractor
+from core.crawler.parse_pool import build_article
+from core.crawler.parsers import ContainerFilter
+
+
+class PageArchive:
+    """
+    Append-only archive of raw article pages as WARC `resource` records, each compressed as its own
+    gzip member like in .warc.gz files. Every record is also listed in a CDX-style sidecar index
+    (`<archive>.cdx`: URL, fetch time, offset and length) so readers can seek straight to it.
+    Both files are opened on the first write, so a crawler that archives nothing creates nothing.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path: str = file_path
+        self.file: BinaryIO | None = None
+        self.index: TextIO | None = None
+
+    def __enter__(self) -> 'PageArchive':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def open_files(self) -> None:
+        if directory := path.dirname(self.file_path):
+            makedirs(directory, exist_ok=True)
+        self.file = open(self.file_path, 'ab')
+        self.index = open(index_path(self.file_path), 'a', encoding='utf-8')
+
+    def write(self, url: str, html: str, fetched: datetime | None = None) -> None:
+        if self.file is None:
+            self.open_files()
+        fetched_at: str = (fetched or datetime.now(timezone.utc)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        body: bytes = html.encode('utf-8')
+        header: str = (
+            'WARC/1.1\r\n'
+            'WARC-Type: resource\r\n'
+            f'WARC-Record-ID: <urn:uuid:{uuid4()}>\r\n'
+            f'WARC-Target-URI: {url}\r\n'
+            f'WARC-Date: {fetched_at}\r\n'
+            'Content-Type: text/html; charset=utf-8\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n'
+        )
+        record: bytes = compress(header.encode('utf-8') + body + b'\r\n\r\n')
+        offset: int = self.file.tell()
+        self.file.write(record)
+        self.file.flush()
+        self.index.write(f'{url}\t{fetched_at}\t{offset}\t{len(record)}\n')
+        self.index.flush()
+
+    def close(self) -> None:
+        """Close both files; a later write opens them again for appending."""
+        if self.file is None:
+            return
+        self.file.close()
+        self.index.close()
+        self.file, self.index = None, None
+
+
+def index_path(file_path: str) -> str:
+    return f'{file_path}.cdx'
+
+
+def read_index(file_path: str) -> Iterator[tuple[str, str, int, int]]:
+    """(url, fetch time, offset, length) of every complete record, oldest first."""
+    with open(index_path(file_path), 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.endswith('\n') and len(fields := line.rstrip('\n').split('\t')) == 4:
+                yield fields[0], fields[1], int(fields[2]), int(fields[3])
+
+
+def latest_records(file_path: str) -> dict[str, tuple[int, int]]:
+    """Offset and length of the most recent capture of every archived URL."""
+    return {url: (offset, length) for url, _, offset, length in read_index(file_path)}
+
+
+def read_record(file, offset: int, length: int) -> tuple[dict[str, str], str]:
+    """WARC headers and decoded body of the record at `offset`."""
+    file.seek(offset)
+    head, _, rest = decompress(file.read(length)).partition(b'\r\n\r\n')
+    headers: dict[str, str] = dict(
+        line.split(': ', 1) for line in head.decode('utf-8').split('\r\n')[1:] if ': ' in line
+    )
+    return headers, rest[:int(headers['Content-Length'])].decode('utf-8')
+
+
+def extract_records(
+        extractor: SelectorExtractor,
+        parse_only: ContainerFilter | None,
+        parser: str,
+        file_path: str,
+        records: list[tuple[str, int, int]]
+) -> list[dict[str, str | None]]:
+    """Read a batch of (url, offset, length) records and build their articles; runs in a worker process."""
+    with open(file_path, 'rb') as f:
+        return [
+            build_article(extractor, parse_only, parser, read_record(f, offset, length)[1], url)
+            for url, offset, length in records
+        ]
@@ -0,0 +1,380 @@
+from asyncio import gather, get_running_loop
+from datetime import date
+from hashlib import sha256
+from json import JSONDecodeError, dump, load
+from os import path
+from re import Pattern, compile as compile_pattern
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+from httpx import AsyncClient
+
+from loguru import logger
+
+from core.crawler import consts
+from core.crawler.archive import PageArchive, extract_records, latest_records
+from core.crawler.client import HttpClientFactory, shared_client_factory
+from core.crawler.crawl_index import CrawlIndex, shared_crawl_index
+from core.crawler.dates import published_before
+from core.crawler.discovery import feed_entries, sitemaps_from_robots
+from core.crawler.extractor import SelectorExtractor
+from core.crawler.fetch_engine import FetchEngine
+from core.crawler.metrics import CrawlMetrics
+from core.crawler.parse_pool import build_article, get_parse_pool
+from core.crawler.parsers import ContainerFilter, available_backend, make_soup
+from core.crawler.rate_control import RateController, shared_rate_controller
+from core.crawler.rendering import RenderPool, shared_render_pool
+from core.crawler.sink import JsonlSink
+
+
+class BaseCrawler:
+    # Compiled selector spec of the outlet (consts.ARTICLE_FIELDS) and the parse-time restriction derived from it.
+    extractor: SelectorExtractor | None = None
+    parse_only: ContainerFilter | None = None
+    # Dataset file written by sort_data and rebuilt by reextract.
+    output_file: str | None = None
+    # Listing pages that only fill in with JavaScript are rendered in a headless browser, scrolled this many times.
+    render_listings: bool = False
+    listing_scrolls: int = 0
+    # Sitemaps, RSS/Atom feeds or robots.txt files to discover article links from, and the links to keep.
+    feeds: tuple[str, ...] = ()
+    article_link_pattern: str | None = None
+
+    def __init__(
+            self,
+            engine: FetchEngine | None = None,
+            client_factory: HttpClientFactory | None = None,
+            rate_controller: RateController | None = None,
+            index: CrawlIndex | None = None,
+            incremental: bool = True,
+            recheck_after: float | None = consts.RECHECK_AFTER,
+            parser: str = consts.PARSER_BACKEND,
+            restrict_parsing: bool = True,
+            parse_in_processes: bool = False,
+            sink: JsonlSink | None = None,
+            archive: PageArchive | None = None,
+            archive_pages: bool = consts.ARCHIVE_PAGES,
+            renderer: RenderPool | None = None,
+            render_listings: bool | None = None
+    ):
+        self.client: AsyncClient = (client_factory or shared_client_factory()).client
+        self.rate_controller: RateController = rate_controller or shared_rate_controller()
+        self.engine: FetchEngine = engine or FetchEngine()
+        self.index: CrawlIndex | None = (index or shared_crawl_index()) if incremental else None
+        self.recheck_after: float | None = recheck_after
+        self.parser: str = available_backend(parser)
+        self.restrict_parsing: bool = restrict_parsing
+        self.parse_in_processes: bool = parse_in_processes
+        self.sink: JsonlSink | None = sink
+        self.archive: PageArchive | None = (archive or PageArchive(self.archive_path())) if archive_pages else None
+        if render_listings is not None:
+            self.render_listings = render_listings
+        self.renderer: RenderPool | None = (renderer or shared_render_pool()) if self.render_listings else None
+        self.metrics: CrawlMetrics = CrawlMetrics(type(self).__name__)
+        # Listing pages already fetched for another purpose, e.g. the first page read for its page count.
+        self.prefetched: dict[str, str] = {}
+
+    @classmethod
+    def archive_path(cls) -> str:
+        return consts.ARCHIVE_PATH.format(outlet=cls.__name__)
+
+    @classmethod
+    def sink_path(cls) -> str:
+        """JSON Lines file next to the outlet's dataset that a sink streams its articles to."""
+        return f'{path.splitext(cls.output_file)[0]}.jsonl'
+
+    def make_soup(self, response: str) -> BeautifulSoup:
+        """Parse a listing page with the configured backend."""
+        return make_soup(response, self.parser)
+
+    async def fetch_links(self, url: str) -> str | None:
+        host: str = urlsplit(url).netloc
+        started: float = perf_counter()
+        try:
+            response = await self.rate_controller.get(self.client, url, self.metrics)
+            response.raise_for_status()
+            self.metrics.observe_fetch(
+                host, perf_counter() - started, len(response.content), response.extensions.get('from_cache', False)
+            )
+            await self.engine.throttle(len(response.content))
+            return response.text
+        except Exception as e:
+            self.metrics.observe_error(host)
+            logger.warning(f'Error fetching {url}: {e}')
+
+    async def fetch_listing(self, url: str) -> str | None:
+        """
+        Fetch a listing page, through the render pool for outlets with `render_listings`. When rendering
+        fails the page is fetched without it, so at least the items in the initial HTML are found.
+        A prefetched page is served once from memory instead.
+        """
+        if (html := self.prefetched.pop(url, None)) is not None:
+            return html
+        if not self.renderer:
+            return await self.fetch_links(url)
+        host: str = urlsplit(url).netloc
+        started: float = perf_counter()
+        try:
+            html: str = await self.renderer.render(url, self.listing_scrolls)
+        except Exception as e:
+            self.metrics.observe_error(host)
+            logger.warning(f'Error rendering {url}, fetching it without rendering: {e}')
+            return await self.fetch_links(url)
+        self.metrics.observe_fetch(host, perf_counter() - started, len(html.encode()), False)
+        return html
+
+    async def read_feed(self, url: str) -> list[tuple[str, str, date | None]] | None:
+        """
+        Entries of one sitemap or feed, parsed while it downloads. The request goes through the rate
+        controller like every other GET; None when it cannot be fetched or parsed.
+        """
+        host: str = urlsplit(url).netloc
+        started: float = perf_counter()
+        try:
+            async with self.rate_controller.stream(self.client, url, self.metrics) as response:
+                response.raise_for_status()
+                entries: list[tuple[str, str, date | None]] = [
+                    entry async for entry in feed_entries(response.aiter_bytes(), urlsplit(url).path.endswith('.gz'))
+                ]
+            self.metrics.observe_fetch(
+                host, perf_counter() - started, response.num_bytes_downloaded,
+                response.extensions.get('from_cache', False)
+            )
+            await self.engine.throttle(response.num_bytes_downloaded)
+            return entries
+        except Exception as e:
+            self.metrics.observe_error(host)
+            logger.warning(f'Cannot read feed {url}: {e}')
+
+    async def discover_from_feeds(self, since: date | None = None) -> list[str] | None:
+        """
+        Article links from the outlet's `feeds`; robots.txt entries expand to the sitemaps they list
+        and sitemap indexes are followed. With `since`, child sitemaps and entries last modified
+        before it are skipped. Returns None when no feed could be read, so callers fall back to
+        HTML pagination.
+        """
+        pattern: Pattern | None = compile_pattern(self.article_link_pattern) if self.article_link_pattern else None
+        pending: list[str] = list(self.feeds)
+        visited: set[str] = set()
+        links: dict[str, None] = {}
+        read_any: bool = False
+        while pending:
+            if (url := pending.pop(0)) in visited:
+                continue
+            visited.add(url)
+            if urlsplit(url).path.endswith('robots.txt'):
+                pending.extend(sitemaps_from_robots(await self.engine.run(url, self.fetch_links) or ''))
+                continue
+            if (entries := await self.engine.run(url, self.read_feed)) is None:
+                continue
+            for kind, location, modified in entries:
+                if since and modified and modified < since:
+                    continue
+                if kind == 'sitemap':
+                    pending.append(location)
+                elif not pattern or pattern.match(location):
+                    links[location] = None
+            read_any = True
+        if not read_any:
+            return
+        logger.info(f'Discovered {len(links)} article links from {len(visited)} feeds.')
+        return list(links)
+
+    async def parse_article(self, response: str, article_url: str) -> dict[str, str] | None:
+        """
+        Build the article dict from the page HTML using the outlet's selector spec. With
+        `parse_in_processes` the parsing runs in the shared process pool so the event loop
+        only does network I/O.
+        """
+        parse_only: ContainerFilter | None = self.parse_only if self.restrict_parsing else None
+        started: float = perf_counter()
+        if self.parse_in_processes:
+            article_data = await get_running_loop().run_in_executor(
+                get_parse_pool(), build_article, self.extractor, parse_only, self.parser, response, article_url
+            )
+        else:
+            article_data = build_article(self.extractor, parse_only, self.parser, response, article_url)
+        self.metrics.observe_parse(perf_counter() - started)
+        return article_data
+
+    async def extract_article_data(self, article_url: str, since: date | None = None) -> dict[str, str] | None:
+        """
+        Fetch and parse an article, skipping it if the crawl index says it was already harvested.
+        An article published before `since` is returned without being recorded, written to the sink
+        or counted, so callers can tell it apart from a failed fetch.
+        """
+        if self.index and self.index.is_fresh(article_url, self.recheck_after):
+            return
+        if not (response := await self.fetch_links(article_url)):
+            logger.warning(f'Error fetching article {article_url}')
+            return
+        content_hash: str = sha256(response.encode()).hexdigest()
+        if self.index and self.index.is_unchanged(article_url, content_hash):
+            self.index.record(article_url, type(self).__name__, content_hash)
+            return
+        if self.archive:
+            self.archive.write(article_url, response)
+        if not (article_data := await self.parse_article(response, article_url)):
+            return
+        if published_before(article_data, since):
+            return article_data
+        if self.index:
+            self.index.record(article_url, type(self).__name__, content_hash)
+        if self.sink:
+            self.sink.write(article_data)
+        self.metrics.observe_article()
+        return article_data
+
+    async def collect_articles(self, links: list[str]) -> list[dict[str, str]]:
+        """
+        Extract all articles concurrently, keeping the order of `links`. With a sink the articles are
+        already on disk, so none are kept.
+        """
+        return [
+            article_data for article_data in await self.engine.gather(links, self.extract_article_data)
+            if article_data and not self.sink
+        ]
+
+    async def stream_articles(
+            self,
+            page_urls: Iterable[str],
+            discover: Callable[[str], Awaitable[list[str] | None]]
+    ) -> AsyncIterator[dict[str, str]]:
+        """Discover links from listing pages and extract articles as soon as each link is found."""
+        async for article_data in self.engine.stream(page_urls, discover, self.extract_article_data):
+            if article_data:
+                yield article_data
+
+    async def drain(self, articles: AsyncIterator[dict[str, str]]) -> list[dict[str, str]]:
+        """Consume streamed articles, keeping them in memory only when no sink holds them already."""
+        return [article_data async for article_data in articles if not self.sink]
+
+    async def reextract(
+            self,
+            archive_path: str | None = None,
+            batch_size: int = consts.REEXTRACT_BATCH
+    ) -> list[dict[str, str]]:
+        """
+        Rebuild articles from the latest archived capture of every page with the current selector
+        spec. Batches of records are read and parsed in the process pool, so no network is used and
+        the rebuild runs at disk and CPU speed.
+        """
+        archive_path = archive_path or self.archive_path()
+        records: list[tuple[str, int, int]] = [
+            (url, offset, length) for url, (offset, length) in latest_records(archive_path).items()
+        ]
+        parse_only: ContainerFilter | None = self.parse_only if self.restrict_parsing else None
+        loop = get_running_loop()
+        batches: list[list[dict[str, str]]] = await gather(*(
+            loop.run_in_executor(
+                get_parse_pool(), extract_records, self.extractor, parse_only, self.parser, archive_path,
+                records[i:i + batch_size]
+            )
+            for i in range(0, len(records), batch_size)
+        ))
+        all_articles_data: list[dict[str, str]] = [
+            article_data for batch in batches for article_data in batch if article_data
+        ]
+        logger.info(f'Re-extracted {len(all_articles_data)} articles from {archive_path}.')
+        return all_articles_data
+
+    def report_metrics(self, metrics_format: str = consts.METRICS_FORMAT) -> None:
+        """Write this run's metrics; called at the end of every sort_data."""
+        extension: str = 'prom' if metrics_format == 'prometheus' else 'json'
+        self.metrics.export(
+            consts.METRICS_FILE.format(outlet=type(self).__name__, extension=extension), metrics_format
+        )
+
+    def last_run(self) -> date | None:
+        """Date of this outlet's last successful crawl, usable as the `since` cutoff."""
+        return self.index.last_run(type(self).__name__) if self.index else None
+
+    async def collect_since(
+            self,
+            page_urls: Iterable[str],
+            discover: Callable[[str], Awaitable[list[str] | None]],
+            since: date
+    ) -> list[dict[str, str]]:
+        """
+        Walk newest-first listing pages in order and stop after the first page that holds only
+        articles published before `since` or already harvested by a previous run. Articles on a
+        page are still extracted concurrently; articles older than `since` are dropped before they
+        reach the sink or the crawl index.
+        """
+        all_articles_data: list[dict[str, str]] = []
+        for page_url in page_urls:
+            if not (links := await self.engine.run(page_url, discover)):
+                continue
+            seen: list[bool] = [bool(self.index and self.index.is_fresh(link, self.recheck_after)) for link in links]
+            articles: list[dict[str, str] | None] = await self.engine.gather(
+                [link for link, is_seen in zip(links, seen) if not is_seen],
+                lambda link: self.extract_article_data(link, since)
+            )
+            fresh: list[dict[str, str]] = [
+                article_data for article_data in articles
+                if article_data and not published_before(article_data, since)
+            ]
+            if not self.sink:
+                all_articles_data.extend(fresh)
+            if not fresh and all(articles):
+                logger.info(f'Reached articles older than {since} on {page_url}, stopping.')
+                break
+        return all_articles_data
+
+    def save_to_json(
+            self,
+            file_path: str,
+            data: list[dict[str, str]],
+            merge: bool | None = None
+    ) -> list[dict[str, str]]:
+        """
+        Merge freshly extracted articles into the dataset at `file_path` (matching on link, new
+        versions win) and mark this run's crawl index records as saved once the file is written.
+        `merge` defaults to whether the crawl is incremental.
+        """
+        merged: dict[str, dict[str, str]] = {}
+        if (bool(self.index) if merge is None else merge) and path.exists(file_path):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    merged = {article['link']: article for article in load(f)}
+            except (JSONDecodeError, KeyError, TypeError) as e:
+                logger.warning(f'Cannot merge into {file_path}, overwriting it: {e}')
+        merged.update({article['link']: article for article in data})
+        all_articles_data: list[dict[str, str]] = list(merged.values())
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                dump(all_articles_data, f, ensure_ascii=False, indent=4)
+            logger.info(f'Data saved to {file_path}')
+        except Exception as e:
+            logger.error(f'Error saving data to JSON: {e}')
+            return all_articles_data
+        if self.index:
+            self.index.record_run(type(self).__name__)
+        return all_articles_data
+
+    def finish(self, all_articles_data: list[dict[str, str]]) -> list[dict[str, str]]:
+        """
+        End of every sort_data. Articles streamed to a sink are final once it is closed, so the run is
+        recorded as saved; otherwise they are merged into the outlet's dataset. Then the run's metrics
+        are written and the page archive is closed.
+        """
+        if self.sink:
+            self.sink.close()
+            logger.info(f'Streamed {self.sink.written} articles to {self.sink.file_path}.')
+            if self.index:
+                self.index.record_run(type(self).__name__)
+        else:
+            logger.info(f'Collected data for {len(all_articles_data)} articles.')
+            self.save_to_json(self.output_file, all_articles_data)
+        self.report_metrics()
+        self.close()
+        return all_articles_data
+
+    def close(self) -> None:
+        """Flush and close the crawler's sink and page archive; safe to call more than once."""
+        if self.sink:
+            self.sink.close()
+        if self.archive:
+            self.archive.close()
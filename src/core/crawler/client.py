@@ -0,0 +1,130 @@
+from collections import Counter
+from typing import Any
+
+from httpx import AsyncBaseTransport, AsyncClient, AsyncHTTPTransport, Limits, Request, Response, Timeout
+
+from loguru import logger
+
+from core.crawler import consts
+from core.crawler.http_cache import CachingTransport, HttpCache
+
+
+class ConnectionStats:
+    """Counts requests against newly opened connections to show how well the pool is reused."""
+
+    def __init__(self):
+        self.requests: int = 0
+        self.new_connections: int = 0
+        self.http_versions: Counter[str] = Counter()
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+    async def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == 'connection.connect_tcp.complete':
+            self.new_connections += 1
+
+    async def on_request(self, request: Request) -> None:
+        self.requests += 1
+        request.extensions['trace'] = self.trace
+
+    async def on_response(self, response: Response) -> None:
+        self.http_versions[response.http_version] += 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'new_connections': self.new_connections,
+            'reused': self.reused,
+            'reuse_ratio': round(self.reuse_ratio, 3),
+            'http_versions': dict(self.http_versions),
+        }
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HttpClientFactory:
+    """
+    Builds the one pooled AsyncClient every crawler shares: connection limits, HTTP/2, keep-alive,
+    timeouts and the on-disk response cache. Use it as an async context manager to close the pool.
+    """
+
+    def __init__(
+            self,
+            max_connections: int = consts.MAX_CONNECTIONS,
+            max_keepalive_connections: int = consts.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry: float = consts.KEEPALIVE_EXPIRY,
+            timeout: float = consts.TIMEOUT,
+            connect_timeout: float = consts.CONNECT_TIMEOUT,
+            http2: bool = True,
+            cache: HttpCache | None = None,
+            use_cache: bool = True,
+            transport: AsyncBaseTransport | None = None
+    ):
+        """`transport` replaces the network transport, e.g. to serve every request from a local stand-in."""
+        if http2 and not http2_available():
+            logger.warning('h2 is not installed, falling back to HTTP/1.1.')
+            http2 = False
+        self.limits: Limits = Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout: Timeout = Timeout(timeout, connect=connect_timeout)
+        self.http2: bool = http2
+        self.cache: HttpCache | None = (cache or HttpCache()) if use_cache else None
+        self.stats: ConnectionStats = ConnectionStats()
+        self.transport: AsyncBaseTransport | None = transport
+        self._client: AsyncClient | None = None
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None or self._client.is_closed:
+            transport = self.transport or AsyncHTTPTransport(http2=self.http2, limits=self.limits)
+            self._client = AsyncClient(
+                transport=CachingTransport(self.cache, transport) if self.cache else transport,
+                timeout=self.timeout,
+                follow_redirects=True,
+                event_hooks={'request': [self.stats.on_request], 'response': [self.stats.on_response]}
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info(f'HTTP client closed: {self.stats.summary()}')
+
+    async def __aenter__(self) -> 'HttpClientFactory':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+_shared_factory: HttpClientFactory | None = None
+
+
+def shared_client_factory() -> HttpClientFactory:
+    """Process-wide factory used by crawlers that are not given one explicitly."""
+    global _shared_factory
+    if _shared_factory is None:
+        _shared_factory = HttpClientFactory()
+    return _shared_factory
+
+
+async def close_shared_client() -> None:
+    global _shared_factory
+    if _shared_factory is not None:
+        await _shared_factory.aclose()
+        _shared_factory = None
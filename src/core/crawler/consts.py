@@ -0,0 +1,67 @@
+from typing import Final
+
+GLOBAL_CONCURRENCY: Final[int] = 20
+PER_HOST_CONCURRENCY: Final[int] = 5
+QUEUE_SIZE_FACTOR: Final[int] = 2
+
+HTTP_CACHE_PATH: Final[str] = 'http_cache.sqlite'
+HTTP_CACHE_MAX_BYTES: Final[int] = 512 * 1024 * 1024
+
+CRAWL_INDEX_PATH: Final[str] = 'crawl_index.sqlite'
+# Seconds a write waits for another process holding the index's write lock.
+CRAWL_INDEX_TIMEOUT: Final[float] = 30.0
+# Seconds after which an already harvested URL is fetched again to check for changes; None never re-checks.
+RECHECK_AFTER: Final[float | None] = None
+
+# 'lxml' (C-backed, default) or 'html.parser'.
+PARSER_BACKEND: Final[str] = 'lxml'
+
+# Worker processes for off-loop HTML parsing; None uses the CPU count.
+PARSE_WORKERS: Final[int | None] = None
+
+# Raw article pages are appended to a per-outlet WARC-style archive for offline re-extraction.
+ARCHIVE_PAGES: Final[bool] = True
+ARCHIVE_PATH: Final[str] = 'archive/{outlet}.warc.gz'
+REEXTRACT_BATCH: Final[int] = 50
+
+# Headless rendering of listing pages that need JavaScript; crawlers opt in with `render_listings`.
+RENDER_POOL_SIZE: Final[int] = 2
+RENDER_TIMEOUT: Final[float] = 30.0
+RENDER_SCROLL_PAUSE: Final[float] = 1.0
+RENDER_BLOCKED_RESOURCES: Final[frozenset[str]] = frozenset({'image', 'font', 'media'})
+# Chromium-based browser to render with instead of Playwright's own download, e.g. a system Chrome.
+RENDER_BROWSER_PATH: Final[str | None] = None
+
+SINK_FSYNC_EVERY: Final[int] = 50
+SINK_FSYNC_INTERVAL: Final[float] = 5.0
+SINK_POLL_INTERVAL: Final[float] = 0.5
+
+MAX_CONNECTIONS: Final[int] = 50
+MAX_KEEPALIVE_CONNECTIONS: Final[int] = 20
+KEEPALIVE_EXPIRY: Final[float] = 30.0
+TIMEOUT: Final[float] = 30.0
+CONNECT_TIMEOUT: Final[float] = 10.0
+
+# Shared budget for the multi-outlet orchestrator; bandwidth is in bytes per second (None is unlimited).
+ORCHESTRATOR_CONCURRENCY: Final[int] = 30
+ORCHESTRATOR_BANDWIDTH: Final[float | None] = None
+PROGRESS_INTERVAL: Final[float] = 10.0
+
+# Per-host politeness: AIMD concurrency, retries and circuit breaking.
+AIMD_INITIAL_LIMIT: Final[float] = 4.0
+AIMD_MIN_LIMIT: Final[float] = 1.0
+AIMD_MAX_LIMIT: Final[float] = 16.0
+AIMD_DECREASE_FACTOR: Final[float] = 0.5
+LATENCY_TARGET: Final[float] = 5.0
+RETRY_ATTEMPTS: Final[int] = 4
+RETRY_BASE_DELAY: Final[float] = 0.5
+RETRY_MAX_DELAY: Final[float] = 60.0
+RETRY_STATUSES: Final[frozenset[int]] = frozenset({429, 500, 502, 503, 504})
+BREAKER_THRESHOLD: Final[int] = 5
+BREAKER_COOLDOWN: Final[float] = 60.0
+
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS: Final[tuple[float, ...]] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+# 'json' or 'prometheus'; metrics are written to METRICS_FILE at the end of every sort_data.
+METRICS_FORMAT: Final[str] = 'json'
+METRICS_FILE: Final[str] = 'metrics_{outlet}.{extension}'
@@ -0,0 +1,93 @@
+import sqlite3
+from datetime import date, datetime
+from time import time
+from uuid import uuid4
+
+from core.crawler import consts
+
+
+class CrawlIndex:
+    """
+    Persistent seen-URL index shared by all crawlers. Each row holds the outlet, the last fetch
+    time and a hash of the fetched page, so re-crawls can skip articles that were already harvested.
+    Records are committed as they are made but stay `pending` on this run until the dataset they
+    belong to has been saved; pending records of other (e.g. crashed) runs are ignored.
+    """
+
+    def __init__(self, path: str = consts.CRAWL_INDEX_PATH):
+        self.run_id: str = uuid4().hex
+        self.connection: sqlite3.Connection = sqlite3.connect(path, timeout=consts.CRAWL_INDEX_TIMEOUT)
+        # WAL lets other processes read the index while a crawl commits its records.
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS articles ('
+            'url TEXT PRIMARY KEY, outlet TEXT, fetched_at REAL, content_hash TEXT, pending TEXT)'
+        )
+        if 'pending' not in {column[1] for column in self.connection.execute('PRAGMA table_info(articles)')}:
+            # Rows of older indexes were only ever committed after their dataset was saved.
+            self.connection.execute('ALTER TABLE articles ADD COLUMN pending TEXT')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS runs (outlet TEXT PRIMARY KEY, finished_at REAL)')
+        self.connection.commit()
+
+    def get(self, url: str) -> tuple[float, str] | None:
+        """Fetch time and content hash of a saved record, or one made earlier in this run."""
+        return self.connection.execute(
+            'SELECT fetched_at, content_hash FROM articles WHERE url = ? AND (pending IS NULL OR pending = ?)',
+            (url, self.run_id)
+        ).fetchone()
+
+    def is_fresh(self, url: str, recheck_after: float | None = consts.RECHECK_AFTER) -> bool:
+        """True if the URL was harvested before and is not yet due for a re-check."""
+        if not (row := self.get(url)):
+            return False
+        return recheck_after is None or time() - row[0] < recheck_after
+
+    def is_unchanged(self, url: str, content_hash: str) -> bool:
+        return (row := self.get(url)) is not None and row[1] == content_hash
+
+    def record(self, url: str, outlet: str, content_hash: str) -> None:
+        """Record a fetch; a saved record whose page did not change stays saved."""
+        self.connection.execute(
+            'INSERT INTO articles VALUES (?, ?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET '
+            'outlet = excluded.outlet, fetched_at = excluded.fetched_at, content_hash = excluded.content_hash, '
+            'pending = CASE WHEN pending IS NULL AND content_hash = excluded.content_hash THEN NULL '
+            'ELSE excluded.pending END',
+            (url, outlet, time(), content_hash, self.run_id)
+        )
+        self.connection.commit()
+
+    def record_run(self, outlet: str) -> None:
+        """Mark the outlet's records of this run as saved, together with the run itself."""
+        with self.connection:
+            self.connection.execute(
+                'UPDATE articles SET pending = NULL WHERE outlet = ? AND pending = ?', (outlet, self.run_id)
+            )
+            self.connection.execute('INSERT OR REPLACE INTO runs VALUES (?, ?)', (outlet, time()))
+
+    def last_run(self, outlet: str) -> date | None:
+        """Date of the outlet's last successfully saved crawl."""
+        if not (row := self.connection.execute('SELECT finished_at FROM runs WHERE outlet = ?', (outlet,)).fetchone()):
+            return
+        return datetime.fromtimestamp(row[0]).date()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+_shared_index: CrawlIndex | None = None
+
+
+def shared_crawl_index() -> CrawlIndex:
+    """Process-wide index, so all crawlers write through one connection instead of locking each other out."""
+    global _shared_index
+    if _shared_index is None:
+        _shared_index = CrawlIndex()
+    return _shared_index
+
+
+def close_shared_crawl_index() -> None:
+    global _shared_index
+    if _shared_index is not None:
+        _shared_index.close()
+        _shared_index = None
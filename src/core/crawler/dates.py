@@ -0,0 +1,44 @@
+import re
+from datetime import date
+
+# Genitive month names as they appear in Ukrainian article dates ("11 березня 2025").
+UA_MONTHS: dict[str, int] = {
+    'січня': 1, 'лютого': 2, 'березня': 3, 'квітня': 4, 'травня': 5, 'червня': 6,
+    'липня': 7, 'серпня': 8, 'вересня': 9, 'жовтня': 10, 'листопада': 11, 'грудня': 12
+}
+
+_NUMERIC_DATE: re.Pattern = re.compile(r'(\d{1,2})[./](\d{1,2})(?:[./](\d{2,4}))?')
+_TEXT_DATE: re.Pattern = re.compile(r'(\d{1,2})\s+([^\W\d_]+)\s+(\d{4})')
+
+
+def parse_date(raw_date: str | None, today: date | None = None) -> date | None:
+    """
+    Normalize the raw date strings produced by the crawlers into a date:
+    '24.01.2025' (NashiGroshi), '26/10/23' and '27/01' (Antac, current year implied),
+    '11 Березня 2025' (Bihus), '08 березня 2025 00:25' (Hromadske),
+    '26 лютого 2025, 19:00' (Radio Svoboda) and 'Субота, 1 березня 2025, 23:37' (UkrPravda).
+    Returns None if the string cannot be understood.
+    """
+    if not raw_date:
+        return
+    today = today or date.today()
+    try:
+        if match := _TEXT_DATE.search(raw_date):
+            day, month_name, year = match.groups()
+            if not (month := UA_MONTHS.get(month_name.lower())):
+                return
+            return date(int(year), month, int(day))
+        if match := _NUMERIC_DATE.search(raw_date):
+            day, month, year = match.groups()
+            if year is None:
+                parsed: date = date(today.year, int(month), int(day))
+                # A day/month without a year that lies in the future belongs to the previous year.
+                return parsed if parsed <= today else parsed.replace(year=today.year - 1)
+            return date(int(year) + 2000 if len(year) == 2 else int(year), int(month), int(day))
+    except ValueError:
+        return
+
+
+def published_before(article_data: dict[str, str], since: date | None) -> bool:
+    """True if the article has a readable date older than `since`; undated articles are kept."""
+    return since is not None and (published := parse_date(article_data.get('date'))) is not None and published < since
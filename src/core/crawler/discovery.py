@@ -0,0 +1,84 @@
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Final
+from xml.etree.ElementTree import Element, XMLPullParser
+from zlib import MAX_WBITS, decompressobj
+
+# Element names, without namespace, that close one entry of a sitemap, sitemap index, RSS or Atom feed.
+PAGE_ENTRIES: Final[frozenset[str]] = frozenset({'url', 'item', 'entry'})
+SITEMAP_ENTRIES: Final[frozenset[str]] = frozenset({'sitemap'})
+LOCATION_TAGS: Final[tuple[str, ...]] = ('loc', 'link')
+MODIFIED_TAGS: Final[tuple[str, ...]] = ('lastmod', 'updated', 'pubDate', 'date', 'published')
+
+
+def local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def feed_date(raw: str | None) -> date | None:
+    """W3C datetime (sitemaps, Atom) or RFC 822 (RSS) to a date."""
+    if not raw or not (raw := raw.strip()):
+        return
+    try:
+        return date.fromisoformat(raw[:10])
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(raw).date()
+    except (TypeError, ValueError):
+        return
+
+
+def entry_fields(element: Element) -> tuple[str | None, date | None]:
+    """Location and modification date of one entry; Atom keeps the location in a link's href."""
+    children: dict[str, Element] = {}
+    for child in element:
+        children.setdefault(local_name(child.tag), child)
+    location: str | None = None
+    for tag in LOCATION_TAGS:
+        if (child := children.get(tag)) is not None:
+            location = (child.text or child.get('href') or '').strip() or None
+            break
+    modified: date | None = next(
+        (feed_date(children[tag].text) for tag in MODIFIED_TAGS if tag in children), None
+    )
+    return location, modified
+
+
+def sitemaps_from_robots(robots: str) -> list[str]:
+    return [
+        line.split(':', 1)[1].strip() for line in robots.splitlines()
+        if line.lower().startswith('sitemap:') and line.split(':', 1)[1].strip()
+    ]
+
+
+async def feed_entries(
+        chunks: AsyncIterator[bytes],
+        gzipped: bool = False
+) -> AsyncIterator[tuple[str, str, date | None]]:
+    """
+    Stream ('page' | 'sitemap', location, modified) entries out of a sitemap, sitemap index, RSS or
+    Atom document as its bytes arrive. Finished entries are cleared, so memory stays flat however
+    large the document is. Raises xml.etree.ElementTree.ParseError on malformed XML.
+    """
+    parser: XMLPullParser = XMLPullParser(events=('end',))
+    decompressor = decompressobj(16 + MAX_WBITS) if gzipped else None
+    async for chunk in chunks:
+        parser.feed(decompressor.decompress(chunk) if decompressor else chunk)
+        for entry in _read_entries(parser):
+            yield entry
+    parser.close()
+    for entry in _read_entries(parser):
+        yield entry
+
+
+def _read_entries(parser: XMLPullParser) -> list[tuple[str, str, date | None]]:
+    entries: list[tuple[str, str, date | None]] = []
+    for _, element in parser.read_events():
+        if (name := local_name(element.tag)) not in PAGE_ENTRIES and name not in SITEMAP_ENTRIES:
+            continue
+        location, modified = entry_fields(element)
+        if location:
+            entries.append(('sitemap' if name in SITEMAP_ENTRIES else 'page', location, modified))
+        element.clear()
+    return entries
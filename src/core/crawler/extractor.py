@@ -0,0 +1,101 @@
+from typing import Any
+
+from bs4 import BeautifulSoup, Tag
+
+from core.crawler.parsers import ContainerFilter
+
+
+class FieldSelector:
+    """
+    One compiled field of a site's selector spec. Supported keys:
+        tag      tag name (or tuple of names) to match
+        class    space separated classes the tag must all carry
+        count    how many matching tags to join (default 1)
+        inner    tag name(s) searched inside the first match instead of using the match itself
+        pick     index of the `inner` tag to use (e.g. -1 for the last one) instead of the first `count`
+        split    (separator, index) applied to the text
+        replace  (old, new) pairs applied to the text
+        value    constant value; no parsing at all
+        default  returned when nothing matched
+    """
+
+    def __init__(self, name: str, spec: dict[str, Any]):
+        self.name: str = name
+        tag = spec.get('tag')
+        self.tags: frozenset[str] | None = frozenset((tag,) if isinstance(tag, str) else tag) if tag else None
+        self.classes: frozenset[str] = frozenset(spec.get('class', '').split())
+        self.count: int = spec.get('count', 1)
+        self.inner: str | tuple[str, ...] | None = spec.get('inner')
+        self.pick: int | None = spec.get('pick')
+        self.split: tuple[str, int] | None = spec.get('split')
+        self.replace: tuple[tuple[str, str], ...] = spec.get('replace', ())
+        self.value: str | None = spec.get('value')
+        self.default: str | None = spec.get('default')
+        # Tags collected during the traversal: the `count` matches, or the single container for `inner`.
+        self.limit: int = 1 if self.inner else self.count
+
+    @property
+    def is_constant(self) -> bool:
+        return self.tags is None and not self.classes
+
+    def matches(self, tag: Tag) -> bool:
+        if self.tags is not None and tag.name not in self.tags:
+            return False
+        return not self.classes or self.classes.issubset(tag.get('class') or ())
+
+    def text(self, matched: list[Tag]) -> str | None:
+        if self.is_constant:
+            return self.value
+        if matched and self.inner:
+            inner_tags: list[Tag] = matched[0].find_all(self.inner)
+            if self.pick is not None:
+                matched = inner_tags[self.pick:self.pick + 1 or None] if inner_tags else []
+            else:
+                matched = inner_tags[:self.count]
+        if not matched:
+            return self.default
+        text: str = ' '.join(tag.get_text(strip=True) for tag in matched)
+        if self.split:
+            separator, index = self.split
+            text = text.split(separator)[index]
+        for old, new in self.replace:
+            text = text.replace(old, new)
+        return text.strip()
+
+
+class SelectorExtractor:
+    """
+    Generic article extractor driven by a per-site selector spec (`ARTICLE_FIELDS` in each outlet's
+    consts.py). The spec is compiled once; `extract` collects every field in a single pass over the tree.
+    """
+
+    def __init__(self, spec: dict[str, dict[str, Any]]):
+        self.fields: list[FieldSelector] = [FieldSelector(name, field_spec) for name, field_spec in spec.items()]
+
+    def container_filter(self) -> ContainerFilter:
+        """Parse-time restriction keeping exactly the tags the spec can match."""
+        names: set[str] = set()
+        classes: set[str] = set()
+        for field in self.fields:
+            if field.classes:
+                classes.update(field.classes)
+            elif field.tags:
+                names.update(field.tags)
+        return ContainerFilter(tuple(names), tuple(classes))
+
+    def extract(self, soup: BeautifulSoup) -> dict[str, str | None]:
+        pending: list[FieldSelector] = [field for field in self.fields if not field.is_constant]
+        matched: dict[str, list[Tag]] = {field.name: [] for field in self.fields}
+        for element in soup.descendants:
+            if not pending:
+                break
+            if not isinstance(element, Tag):
+                continue
+            completed: bool = False
+            for field in pending:
+                if field.matches(element):
+                    matched[field.name].append(element)
+                    completed = completed or len(matched[field.name]) >= field.limit
+            if completed:
+                pending = [field for field in pending if len(matched[field.name]) < field.limit]
+        return {field.name: field.text(matched[field.name]) for field in self.fields}
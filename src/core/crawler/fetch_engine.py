@@ -0,0 +1,119 @@
+from asyncio import Queue, Semaphore, create_task, gather
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Final, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from core.crawler import consts
+from core.crawler.scheduling import BandwidthLimiter, FairScheduler
+
+T = TypeVar('T')
+
+_DONE: Final[object] = object()
+
+
+class FetchEngine:
+    """Runs many fetches at once under a global and a per-host concurrency limit."""
+
+    def __init__(
+            self,
+            concurrency: int = consts.GLOBAL_CONCURRENCY,
+            per_host: int = consts.PER_HOST_CONCURRENCY,
+            scheduler: FairScheduler | None = None,
+            outlet: str = 'default',
+            bandwidth: BandwidthLimiter | None = None
+    ):
+        """
+        Pass a `scheduler` (and this engine's `outlet` name) to share one global budget fairly
+        between several crawlers, and a `bandwidth` limiter to cap their combined download rate.
+        """
+        self.concurrency: int = concurrency
+        self.per_host: int = per_host
+        self.semaphore: Semaphore = Semaphore(concurrency)
+        self.host_semaphores: defaultdict[str, Semaphore] = defaultdict(lambda: Semaphore(self.per_host))
+        self.scheduler: FairScheduler | None = scheduler
+        self.outlet: str = outlet
+        self.bandwidth: BandwidthLimiter | None = bandwidth
+        self.completed: int = 0
+        self.failed: int = 0
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        Hold one per-host and one global slot for the duration of a request. The host slot is taken
+        first so requests queued behind a busy host do not sit on global capacity.
+        """
+        async with self.host_semaphores[urlsplit(url).netloc]:
+            async with self.scheduler.slot(self.outlet) if self.scheduler else self.semaphore:
+                yield
+
+    async def run(self, url: str, fetch: Callable[[str], Awaitable[T]]) -> T | None:
+        async with self.slot(url):
+            try:
+                result: T = await fetch(url)
+                self.completed += 1
+                return result
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f'Error processing {url}: {e}')
+
+    async def throttle(self, size: int) -> None:
+        """Account downloaded bytes against the shared bandwidth budget, if any."""
+        if self.bandwidth:
+            await self.bandwidth.consume(size)
+
+    async def gather(self, urls: Iterable[str], fetch: Callable[[str], Awaitable[T]]) -> list[T | None]:
+        """Apply `fetch` to every URL concurrently; results keep the input order."""
+        return await gather(*(self.run(url, fetch) for url in urls))
+
+    async def stream(
+            self,
+            page_urls: Iterable[str],
+            discover: Callable[[str], Awaitable[list[str] | None]],
+            extract: Callable[[str], Awaitable[T]],
+            page_workers: int | None = None,
+            article_workers: int | None = None
+    ) -> AsyncIterator[T]:
+        """
+        Producer/consumer crawl: listing pages are fetched concurrently and every discovered
+        link is queued straight away for article workers. Results are yielded as they complete.
+        Queues are bounded and `page_urls` is consumed lazily, so memory does not grow with
+        the number of listing pages.
+        """
+        page_workers = page_workers or self.per_host
+        article_workers = article_workers or self.concurrency
+        pages: Iterator[str] = iter(page_urls)
+        links: Queue[str | None] = Queue(maxsize=article_workers * consts.QUEUE_SIZE_FACTOR)
+        results: Queue[T | object] = Queue(maxsize=article_workers * consts.QUEUE_SIZE_FACTOR)
+        seen: set[str] = set()
+
+        async def page_worker() -> None:
+            for page_url in pages:
+                for link in await self.run(page_url, discover) or []:
+                    if link not in seen:
+                        seen.add(link)
+                        await links.put(link)
+
+        async def article_worker() -> None:
+            while (link := await links.get()) is not None:
+                if (article := await self.run(link, extract)) is not None:
+                    await results.put(article)
+
+        async def produce() -> None:
+            await gather(*(page_worker() for _ in range(page_workers)))
+            for _ in range(article_workers):
+                await links.put(None)
+
+        async def consume() -> None:
+            await gather(*(article_worker() for _ in range(article_workers)))
+            await results.put(_DONE)
+
+        tasks = [create_task(produce()), create_task(consume())]
+        try:
+            while (item := await results.get()) is not _DONE:
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,113 @@
+import sqlite3
+from json import dumps, loads
+from time import time
+
+from httpx import AsyncBaseTransport, AsyncHTTPTransport, Headers, Request, Response
+
+from loguru import logger
+
+from core.crawler import consts
+
+# Headers that describe the wire encoding rather than the stored (already decoded) body.
+_DROPPED_HEADERS: frozenset[str] = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+
+class HttpCache:
+    """On-disk response store keyed by URL with LRU eviction under a size cap."""
+
+    def __init__(self, path: str = consts.HTTP_CACHE_PATH, max_bytes: int = consts.HTTP_CACHE_MAX_BYTES):
+        self.max_bytes: int = max_bytes
+        self.connection: sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, '
+            'body BLOB, size INTEGER, last_access REAL)'
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        self.connection.commit()
+
+    def get(self, url: str) -> tuple[str | None, str | None, dict[str, str], bytes] | None:
+        row = self.connection.execute(
+            'SELECT etag, last_modified, headers, body FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        if not row:
+            return
+        etag, last_modified, headers, body = row
+        return etag, last_modified, loads(headers), body
+
+    def touch(self, url: str) -> None:
+        self.connection.execute('UPDATE responses SET last_access = ? WHERE url = ?', (time(), url))
+        self.connection.commit()
+
+    def put(self, url: str, etag: str | None, last_modified: str | None, headers: dict[str, str], body: bytes) -> None:
+        self.connection.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, etag, last_modified, dumps(headers), body, len(body), time())
+        )
+        self.evict()
+        self.connection.commit()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits into `max_bytes`."""
+        total: int = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self.connection.execute(
+                'SELECT url, size FROM responses ORDER BY last_access'
+        ).fetchall():
+            self.connection.execute('DELETE FROM responses WHERE url = ?', (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class CachingTransport(AsyncBaseTransport):
+    """
+    httpx transport that revalidates cached GET responses with If-None-Match / If-Modified-Since
+    and serves the stored body when the server answers 304 Not Modified.
+    """
+
+    def __init__(self, cache: HttpCache, transport: AsyncBaseTransport | None = None):
+        self.cache: HttpCache = cache
+        self.transport: AsyncBaseTransport = transport or AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method != 'GET':
+            return await self.transport.handle_async_request(request)
+
+        url: str = str(request.url)
+        if cached := self.cache.get(url):
+            etag, last_modified, _, _ = cached
+            if etag:
+                request.headers['If-None-Match'] = etag
+            if last_modified:
+                request.headers['If-Modified-Since'] = last_modified
+
+        response: Response = await self.transport.handle_async_request(request)
+
+        if response.status_code == 304 and cached:
+            await response.aclose()
+            self.cache.touch(url)
+            _, _, headers, body = cached
+            return Response(200, headers=headers, content=body, request=request, extensions={'from_cache': True})
+
+        etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return response
+
+        body: bytes = await response.aread()
+        headers: dict[str, str] = {
+            key: value for key, value in response.headers.items() if key.lower() not in _DROPPED_HEADERS
+        }
+        try:
+            self.cache.put(url, etag, last_modified, headers, body)
+        except sqlite3.Error as e:
+            logger.warning(f'Cannot cache response for {url}: {e}')
+        return Response(200, headers=Headers(headers), content=body, request=request, extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+        self.cache.close()
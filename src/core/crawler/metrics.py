@@ -0,0 +1,134 @@
+from collections import defaultdict
+from json import dump
+from time import monotonic
+from typing import Any
+
+from loguru import logger
+
+from core.crawler import consts
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple[float, ...] = consts.LATENCY_BUCKETS):
+        self.buckets: tuple[float, ...] = buckets
+        self.counts: list[int] = [0] * len(buckets)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': round(self.sum / self.count, 4) if self.count else 0.0,
+            'buckets': dict(zip(map(str, self.buckets), self.counts)),
+        }
+
+
+class CrawlMetrics:
+    """
+    Per-crawler counters: fetch latency per host, parse/extract time, bytes downloaded, cache hits,
+    retries, fetch errors and article throughput. Exported as a Prometheus text file or a JSON summary.
+    """
+
+    def __init__(self, outlet: str):
+        self.outlet: str = outlet
+        self.fetch_latency: defaultdict[str, Histogram] = defaultdict(Histogram)
+        self.parse_time: Histogram = Histogram(consts.PARSE_BUCKETS)
+        self.bytes_downloaded: defaultdict[str, int] = defaultdict(int)
+        self.cache_hits: defaultdict[str, int] = defaultdict(int)
+        self.retries: defaultdict[str, int] = defaultdict(int)
+        self.fetch_errors: defaultdict[str, int] = defaultdict(int)
+        self.articles: int = 0
+        self.started: float | None = None
+
+    def observe_fetch(self, host: str, latency: float, size: int, from_cache: bool) -> None:
+        self.started = self.started or monotonic() - latency
+        self.fetch_latency[host].observe(latency)
+        self.bytes_downloaded[host] += 0 if from_cache else size
+        self.cache_hits[host] += from_cache
+
+    def observe_error(self, host: str) -> None:
+        self.fetch_errors[host] += 1
+
+    def observe_retry(self, host: str) -> None:
+        self.retries[host] += 1
+
+    def observe_parse(self, seconds: float) -> None:
+        self.parse_time.observe(seconds)
+
+    def observe_article(self) -> None:
+        self.articles += 1
+
+    @property
+    def elapsed(self) -> float:
+        return monotonic() - self.started if self.started else 0.0
+
+    @property
+    def articles_per_second(self) -> float:
+        return self.articles / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'outlet': self.outlet,
+            'elapsed_seconds': round(self.elapsed, 3),
+            'articles': self.articles,
+            'articles_per_second': round(self.articles_per_second, 3),
+            'parse_seconds': self.parse_time.summary(),
+            'fetch_latency_seconds': {host: histogram.summary() for host, histogram in self.fetch_latency.items()},
+            'bytes_downloaded': dict(self.bytes_downloaded),
+            'cache_hits': dict(self.cache_hits),
+            'retries': dict(self.retries),
+            'fetch_errors': dict(self.fetch_errors),
+        }
+
+    def prometheus(self) -> str:
+        outlet: str = f'outlet="{self.outlet}"'
+        lines: list[str] = ['# TYPE crawler_fetch_latency_seconds histogram']
+        for host, histogram in self.fetch_latency.items():
+            lines.extend(_histogram_lines('crawler_fetch_latency_seconds', f'{outlet},host="{host}"', histogram))
+        lines.append('# TYPE crawler_parse_seconds histogram')
+        lines.extend(_histogram_lines('crawler_parse_seconds', outlet, self.parse_time))
+        for name, values in (
+                ('crawler_bytes_downloaded_total', self.bytes_downloaded),
+                ('crawler_cache_hits_total', self.cache_hits),
+                ('crawler_retries_total', self.retries),
+                ('crawler_fetch_errors_total', self.fetch_errors),
+        ):
+            lines.append(f'# TYPE {name} counter')
+            lines.extend(f'{name}{{{outlet},host="{host}"}} {value}' for host, value in values.items())
+        lines.extend([
+            '# TYPE crawler_articles_total counter',
+            f'crawler_articles_total{{{outlet}}} {self.articles}',
+            '# TYPE crawler_articles_per_second gauge',
+            f'crawler_articles_per_second{{{outlet}}} {self.articles_per_second:.3f}',
+        ])
+        return '\n'.join(lines) + '\n'
+
+    def export(self, file_path: str, metrics_format: str = consts.METRICS_FORMAT) -> None:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if metrics_format == 'prometheus':
+                f.write(self.prometheus())
+            else:
+                dump(self.summary(), f, ensure_ascii=False, indent=4)
+        logger.info(
+            f'{self.outlet}: {self.articles} articles in {self.elapsed:.1f}s '
+            f'({self.articles_per_second:.2f}/s), metrics saved to {file_path}'
+        )
+
+
+def _histogram_lines(name: str, labels: str, histogram: Histogram) -> list[str]:
+    lines: list[str] = [
+        f'{name}_bucket{{{labels},le="{bound}"}} {count}' for bound, count in zip(histogram.buckets, histogram.counts)
+    ]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.sum:.6f}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
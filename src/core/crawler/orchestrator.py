@@ -0,0 +1,108 @@
+from asyncio import create_task, gather, sleep
+from datetime import date
+from time import monotonic
+
+from loguru import logger
+
+from core.crawler import consts
+from core.crawler.base import BaseCrawler
+from core.crawler.client import HttpClientFactory
+from core.crawler.crawl_index import CrawlIndex
+from core.crawler.fetch_engine import FetchEngine
+from core.crawler.rendering import close_shared_render_pool
+from core.crawler.scheduling import BandwidthLimiter, FairScheduler
+from core.crawler.sink import JsonlSink
+
+
+class CrawlOrchestrator:
+    """
+    Runs several outlet crawlers concurrently under one global concurrency and bandwidth budget.
+    Global slots are shared through a FairScheduler, so a full refresh takes about as long as the
+    slowest outlet rather than the sum of all of them. Progress is logged per outlet. With `sinks`
+    every outlet streams its articles to a fresh JSONL file at its sink_path() instead of merging
+    them into its JSON dataset. Every outlet stops at `since`, or with `since_last_run` at its own
+    last successful run.
+    """
+
+    def __init__(
+            self,
+            crawler_classes: list[type[BaseCrawler]],
+            concurrency: int = consts.ORCHESTRATOR_CONCURRENCY,
+            bandwidth: float | None = consts.ORCHESTRATOR_BANDWIDTH,
+            per_host: int = consts.PER_HOST_CONCURRENCY,
+            progress_interval: float = consts.PROGRESS_INTERVAL,
+            client_factory: HttpClientFactory | None = None,
+            index: CrawlIndex | None = None,
+            sinks: bool = False,
+            since: date | None = None,
+            since_last_run: bool = False
+    ):
+        self.scheduler: FairScheduler = FairScheduler(concurrency)
+        self.bandwidth: BandwidthLimiter | None = BandwidthLimiter(bandwidth) if bandwidth else None
+        self.progress_interval: float = progress_interval
+        self.since: date | None = since
+        self.since_last_run: bool = since_last_run
+        self.client_factory: HttpClientFactory = client_factory or HttpClientFactory()
+        # One connection for all outlets, so their records never wait on each other's write locks.
+        self.index: CrawlIndex = index or CrawlIndex()
+        self.crawlers: dict[str, BaseCrawler] = {
+            crawler_class.__name__: crawler_class(
+                engine=FetchEngine(
+                    concurrency=concurrency,
+                    per_host=per_host,
+                    scheduler=self.scheduler,
+                    outlet=crawler_class.__name__,
+                    bandwidth=self.bandwidth
+                ),
+                client_factory=self.client_factory,
+                index=self.index,
+                sink=JsonlSink(crawler_class.sink_path()) if sinks else None
+            )
+            for crawler_class in crawler_classes
+        }
+        self.collected: dict[str, int] = {}
+        self.started: float = 0.0
+
+    def progress(self) -> dict[str, dict[str, int | str]]:
+        return {
+            outlet: {
+                'requests': crawler.engine.completed,
+                'failed': crawler.engine.failed,
+                'articles': self.collected.get(outlet, 'running')
+            }
+            for outlet, crawler in self.crawlers.items()
+        }
+
+    async def report_progress(self) -> None:
+        while True:
+            await sleep(self.progress_interval)
+            logger.info(f'Crawl progress after {monotonic() - self.started:.0f}s: {self.progress()}')
+
+    async def run_outlet(self, outlet: str, crawler: BaseCrawler) -> list[dict[str, str]]:
+        started: float = monotonic()
+        try:
+            since: date | None = self.since or (crawler.last_run() if self.since_last_run else None)
+            articles: list[dict[str, str]] = await crawler.sort_data(since=since) or []
+        except Exception as e:
+            logger.error(f'{outlet} crawl failed: {e}')
+            articles = []
+        finally:
+            # Closing writes the sink's `.done` marker, so readers following it stop even after a failure,
+            # and flushes the page archive and its index.
+            crawler.close()
+        self.collected[outlet] = crawler.sink.written if crawler.sink else len(articles)
+        logger.info(f'{outlet} finished in {monotonic() - started:.1f}s with {self.collected[outlet]} articles.')
+        return articles
+
+    async def run(self) -> dict[str, list[dict[str, str]]]:
+        self.started = monotonic()
+        reporter = create_task(self.report_progress())
+        try:
+            results = await gather(*(self.run_outlet(outlet, crawler) for outlet, crawler in self.crawlers.items()))
+        finally:
+            reporter.cancel()
+            await self.client_factory.aclose()
+            self.index.close()
+            await close_shared_render_pool()
+        logger.info(f'All outlets finished in {monotonic() - self.started:.1f}s: {self.progress()}')
+        return dict(zip(self.crawlers, results))
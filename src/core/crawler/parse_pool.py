@@ -0,0 +1,41 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+
+from core.crawler import consts
+from core.crawler.extractor import SelectorExtractor
+from core.crawler.parsers import ContainerFilter, make_soup
+
+_parse_pool: ProcessPoolExecutor | None = None
+
+
+def build_article(
+        extractor: SelectorExtractor,
+        parse_only: ContainerFilter | None,
+        parser: str,
+        response: str,
+        article_url: str
+) -> dict[str, str | None]:
+    """Parse a page and build the article dict. Pure and picklable, so it can run in a worker process."""
+    fields: dict[str, str | None] = extractor.extract(make_soup(response, parser, parse_only))
+    return {
+        'date': fields.get('date'),
+        'link': article_url,
+        'title': fields.get('title'),
+        'author': fields.get('author'),
+        'short_text': fields.get('short_text')
+    }
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all crawlers, sized by PARSE_WORKERS or the CPU count."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=consts.PARSE_WORKERS or cpu_count())
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
+        _parse_pool = None
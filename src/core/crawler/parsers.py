@@ -0,0 +1,46 @@
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+from loguru import logger
+
+from core.crawler import consts
+
+
+class ContainerFilter(ElementFilter):
+    """
+    SoupStrainer-style restriction used while parsing: only tags with one of `names`, or carrying one
+    of `classes`, are built (together with everything nested in them). The rest of the page is skipped.
+    """
+
+    def __init__(self, names: tuple[str, ...] = (), classes: tuple[str, ...] = ()):
+        super().__init__()
+        self.names: frozenset[str] = frozenset(names)
+        self.classes: frozenset[str] = frozenset(classes)
+
+    @property
+    def includes_everything(self) -> bool:
+        return False
+
+    def allow_tag_creation(self, nsprefix: str | None, name: str, attrs: dict[str, str] | None) -> bool:
+        if name in self.names:
+            return True
+        class_attr = (attrs or {}).get('class') or ''
+        return not self.classes.isdisjoint(class_attr.split() if isinstance(class_attr, str) else class_attr)
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+def available_backend(backend: str) -> str:
+    """Fall back to the pure-Python parser if the requested C-backed one is not installed."""
+    if backend == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning('lxml is not installed, falling back to html.parser.')
+            return 'html.parser'
+    return backend
+
+
+def make_soup(markup: str, backend: str = consts.PARSER_BACKEND, parse_only: ElementFilter | None = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, backend, parse_only=parse_only)
@@ -0,0 +1,169 @@
+from asyncio import Condition, sleep
+from contextlib import asynccontextmanager
+from random import uniform
+from time import monotonic
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from httpx import AsyncClient, HTTPError, Response
+
+from loguru import logger
+
+from core.crawler import consts
+from core.crawler.metrics import CrawlMetrics
+from core.http_utils import retry_after
+
+
+class HostController:
+    """
+    Politeness controller for one host. Concurrency follows AIMD: it grows by about one request per
+    window while responses are fast and healthy, and is cut multiplicatively on 429/5xx, transport
+    errors or latency above the target. After BREAKER_THRESHOLD consecutive failures the host is
+    parked for BREAKER_COOLDOWN seconds, then a single probe request decides whether it recovers.
+    """
+
+    def __init__(
+            self,
+            host: str,
+            initial_limit: float = consts.AIMD_INITIAL_LIMIT,
+            min_limit: float = consts.AIMD_MIN_LIMIT,
+            max_limit: float = consts.AIMD_MAX_LIMIT,
+            decrease_factor: float = consts.AIMD_DECREASE_FACTOR,
+            latency_target: float = consts.LATENCY_TARGET,
+            breaker_threshold: int = consts.BREAKER_THRESHOLD,
+            breaker_cooldown: float = consts.BREAKER_COOLDOWN
+    ):
+        self.host: str = host
+        self.limit: float = initial_limit
+        self.min_limit: float = min_limit
+        self.max_limit: float = max_limit
+        self.decrease_factor: float = decrease_factor
+        self.latency_target: float = latency_target
+        self.breaker_threshold: int = breaker_threshold
+        self.breaker_cooldown: float = breaker_cooldown
+        self.in_flight: int = 0
+        self.failures: int = 0
+        self.parked_until: float = 0.0
+        self.condition: Condition = Condition()
+
+    @property
+    def capacity(self) -> int:
+        # A tripped breaker only lets a single probe through once the cooldown is over.
+        return 1 if self.failures >= self.breaker_threshold else max(1, int(self.limit))
+
+    async def acquire(self) -> None:
+        while True:
+            if (parked_for := self.parked_until - monotonic()) > 0:
+                await sleep(parked_for)
+                continue
+            async with self.condition:
+                if self.in_flight < self.capacity:
+                    self.in_flight += 1
+                    return
+                await self.condition.wait()
+
+    async def release(self, healthy: bool, latency: float) -> None:
+        async with self.condition:
+            self.in_flight -= 1
+            if not healthy:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                self.failures += 1
+                if self.failures >= self.breaker_threshold:
+                    self.parked_until = monotonic() + self.breaker_cooldown
+                    logger.warning(f'{self.host} parked for {self.breaker_cooldown:.0f}s after {self.failures} failures.')
+            else:
+                self.failures = 0
+                if latency > self.latency_target:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+
+class RateController:
+    """Per-host AIMD pacing, jittered exponential retry and circuit breaking for crawler requests."""
+
+    def __init__(
+            self,
+            max_attempts: int = consts.RETRY_ATTEMPTS,
+            base_delay: float = consts.RETRY_BASE_DELAY,
+            max_delay: float = consts.RETRY_MAX_DELAY
+    ):
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.hosts: dict[str, HostController] = {}
+        self.retries: int = 0
+
+    def host(self, url: str) -> HostController:
+        netloc: str = urlsplit(url).netloc
+        if netloc not in self.hosts:
+            self.hosts[netloc] = HostController(netloc)
+        return self.hosts[netloc]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def get(self, client: AsyncClient, url: str, metrics: CrawlMetrics | None = None) -> Response:
+        """
+        GET `url` through the host's controller, retrying 429/5xx responses and transport errors.
+        The last response is returned (or the last error raised) once attempts are exhausted.
+        """
+        return await self.send(client, url, metrics)
+
+    @asynccontextmanager
+    async def stream(
+            self,
+            client: AsyncClient,
+            url: str,
+            metrics: CrawlMetrics | None = None
+    ) -> AsyncIterator[Response]:
+        """Like `get`, but the body of the final response is left to be streamed and closed on exit."""
+        response: Response = await self.send(client, url, metrics, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def send(
+            self,
+            client: AsyncClient,
+            url: str,
+            metrics: CrawlMetrics | None = None,
+            stream: bool = False
+    ) -> Response:
+        controller: HostController = self.host(url)
+        for attempt in range(self.max_attempts):
+            await controller.acquire()
+            started: float = monotonic()
+            try:
+                response: Response = await client.send(client.build_request('GET', url), stream=stream)
+            except HTTPError:
+                await controller.release(healthy=False, latency=monotonic() - started)
+                if attempt == self.max_attempts - 1:
+                    raise
+                delay: float = self.backoff(attempt)
+            else:
+                healthy: bool = response.status_code not in consts.RETRY_STATUSES
+                await controller.release(healthy=healthy, latency=monotonic() - started)
+                if healthy or attempt == self.max_attempts - 1:
+                    return response
+                await response.aclose()
+                delay = retry_after(response) or self.backoff(attempt)
+            self.retries += 1
+            if metrics:
+                metrics.observe_retry(controller.host)
+            logger.debug(f'Retrying {url} in {delay:.1f}s (attempt {attempt + 2}/{self.max_attempts}).')
+            await sleep(min(delay, self.max_delay))
+
+
+_shared_controller: RateController | None = None
+
+
+def shared_rate_controller() -> RateController:
+    """Process-wide controller, so every crawler hitting a host shares that host's pacing."""
+    global _shared_controller
+    if _shared_controller is None:
+        _shared_controller = RateController()
+    return _shared_controller
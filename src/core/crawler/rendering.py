@@ -0,0 +1,143 @@
+from asyncio import Lock, Queue
+from typing import Any
+
+from loguru import logger
+
+from core.crawler import consts
+
+
+def playwright_available() -> bool:
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class RenderPool:
+    """
+    Warm pool of headless Chromium pages for listing pages that only fill in with JavaScript. The
+    browser starts on first use with `size` page slots; each slot opens a page in its own context
+    when first needed and keeps reusing it, so the pool size is also the cap on concurrent renders.
+    Images, fonts and media are aborted at the routing layer since only the DOM is needed.
+    """
+
+    def __init__(
+            self,
+            size: int = consts.RENDER_POOL_SIZE,
+            timeout: float = consts.RENDER_TIMEOUT,
+            scroll_pause: float = consts.RENDER_SCROLL_PAUSE,
+            blocked_resources: frozenset[str] = consts.RENDER_BLOCKED_RESOURCES,
+            executable_path: str | None = consts.RENDER_BROWSER_PATH
+    ):
+        self.size: int = size
+        self.timeout: float = timeout
+        self.scroll_pause: float = scroll_pause
+        self.blocked_resources: frozenset[str] = blocked_resources
+        self.executable_path: str | None = executable_path
+        # One entry per slot: an open page, or None while the slot still needs one.
+        self.pages: Queue = Queue()
+        self.lock: Lock = Lock()
+        self.playwright: Any = None
+        self.browser: Any = None
+        self.renders: int = 0
+
+    async def block_resources(self, route: Any) -> None:
+        if route.request.resource_type in self.blocked_resources:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def new_page(self) -> Any:
+        context = await self.browser.new_context()
+        context.set_default_timeout(self.timeout * 1000)
+        await context.route('**/*', self.block_resources)
+        return await context.new_page()
+
+    @staticmethod
+    async def discard(page: Any) -> None:
+        try:
+            await page.context.close()
+        except Exception as e:
+            logger.debug(f'Error closing a failed render page: {e}')
+
+    async def start(self) -> None:
+        async with self.lock:
+            if self.browser:
+                return
+            from playwright.async_api import async_playwright
+            self.playwright = await async_playwright().start()
+            try:
+                self.browser = await self.playwright.chromium.launch(
+                    headless=True, executable_path=self.executable_path
+                )
+            except Exception:
+                await self.playwright.stop()
+                self.playwright = None
+                raise
+            for _ in range(self.size):
+                self.pages.put_nowait(None)
+            logger.info(f'Render pool started with {self.size} pages.')
+
+    async def render(self, url: str, scrolls: int = 0) -> str:
+        """
+        Load `url`, scroll to the bottom `scrolls` times so infinite feeds load more items, and
+        return the resulting HTML. A page that fails is closed and its slot opens a fresh one on
+        its next render.
+        """
+        await self.start()
+        page = await self.pages.get()
+        try:
+            if page is None:
+                page = await self.new_page()
+            await page.goto(url, wait_until='domcontentloaded')
+            for _ in range(scrolls):
+                await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+                await page.wait_for_timeout(self.scroll_pause * 1000)
+            html: str = await page.content()
+            self.renders += 1
+            return html
+        except Exception:
+            if page is not None:
+                await self.discard(page)
+                page = None
+            raise
+        finally:
+            self.pages.put_nowait(page)
+
+    async def aclose(self) -> None:
+        """Close the browser and forget its pages; a later render starts a new one."""
+        if not self.browser:
+            return
+        await self.browser.close()
+        await self.playwright.stop()
+        self.browser, self.playwright = None, None
+        self.pages = Queue()
+        logger.info(f'Render pool closed after {self.renders} renders.')
+
+    async def __aenter__(self) -> 'RenderPool':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+_shared_pool: RenderPool | None = None
+
+
+def shared_render_pool() -> RenderPool | None:
+    """Process-wide pool for crawlers with `render_listings`; None when Playwright is not installed."""
+    global _shared_pool
+    if _shared_pool is None:
+        if not playwright_available():
+            logger.warning('playwright is not installed, listing pages are fetched without rendering.')
+            return
+        _shared_pool = RenderPool()
+    return _shared_pool
+
+
+async def close_shared_render_pool() -> None:
+    global _shared_pool
+    if _shared_pool is not None:
+        await _shared_pool.aclose()
+        _shared_pool = None
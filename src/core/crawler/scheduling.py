@@ -0,0 +1,74 @@
+from asyncio import CancelledError, Future, get_running_loop, sleep
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic
+from typing import AsyncIterator
+
+
+class FairScheduler:
+    """
+    Global concurrency budget shared by several outlets. When slots are scarce they are handed out
+    round-robin across the outlets that are waiting, so one large archive cannot starve the others.
+    """
+
+    def __init__(self, concurrency: int):
+        self.available: int = concurrency
+        self.waiters: dict[str, deque[Future]] = {}
+        self.rotation: deque[str] = deque()
+
+    async def acquire(self, outlet: str) -> None:
+        if self.available > 0 and not self.rotation:
+            self.available -= 1
+            return
+        future: Future = get_running_loop().create_future()
+        self.waiters.setdefault(outlet, deque()).append(future)
+        if outlet not in self.rotation:
+            self.rotation.append(outlet)
+        try:
+            await future
+        except CancelledError:
+            # The slot was already handed to us; pass it on instead of leaking it.
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        while self.rotation:
+            outlet: str = self.rotation.popleft()
+            queue: deque[Future] = self.waiters[outlet]
+            while queue and queue[0].done():
+                queue.popleft()
+            if not queue:
+                continue
+            future: Future = queue.popleft()
+            if queue:
+                self.rotation.append(outlet)
+            future.set_result(None)
+            return
+        self.available += 1
+
+    @asynccontextmanager
+    async def slot(self, outlet: str) -> AsyncIterator[None]:
+        await self.acquire(outlet)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class BandwidthLimiter:
+    """Token bucket over downloaded bytes; callers sleep off any debt beyond `bytes_per_second`."""
+
+    def __init__(self, bytes_per_second: float, burst: float | None = None):
+        self.rate: float = bytes_per_second
+        self.capacity: float = burst or bytes_per_second
+        self.tokens: float = self.capacity
+        self.updated: float = monotonic()
+
+    async def consume(self, size: int) -> None:
+        now: float = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= size
+        if self.tokens < 0:
+            await sleep(-self.tokens / self.rate)
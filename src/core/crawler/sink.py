@@ -0,0 +1,110 @@
+from asyncio import sleep
+from json import dump, dumps, loads
+from os import fsync, path, remove
+from time import monotonic
+from typing import Any, AsyncIterator, Iterator
+
+from loguru import logger
+
+from core.crawler import consts
+
+
+class JsonlSink:
+    """
+    Append-only JSON Lines writer: every article is written the moment it is extracted and the file
+    is fsynced periodically, so a crash loses at most the last few records. A new sink starts the
+    file afresh unless `append` is set. On close a `.done` marker is written next to the file so
+    readers following it know the crawl has finished.
+    """
+
+    def __init__(
+            self,
+            file_path: str,
+            append: bool = False,
+            fsync_every: int = consts.SINK_FSYNC_EVERY,
+            fsync_interval: float = consts.SINK_FSYNC_INTERVAL
+    ):
+        self.file_path: str = file_path
+        self.fsync_every: int = fsync_every
+        self.fsync_interval: float = fsync_interval
+        if path.exists(done_marker(file_path)):
+            remove(done_marker(file_path))
+        self.file = open(file_path, 'a' if append else 'w', encoding='utf-8')
+        self.written: int = 0
+        self.unsynced: int = 0
+        self.last_sync: float = monotonic()
+
+    def __enter__(self) -> 'JsonlSink':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def write(self, article: dict[str, Any]) -> None:
+        self.file.write(dumps(article, ensure_ascii=False) + '\n')
+        self.file.flush()
+        self.written += 1
+        self.unsynced += 1
+        if self.unsynced >= self.fsync_every or monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = monotonic()
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+        open(done_marker(self.file_path), 'w').close()
+
+    def export_json(self, json_path: str) -> int:
+        self.file.flush()
+        return export_json(self.file_path, json_path)
+
+
+def done_marker(file_path: str) -> str:
+    return f'{file_path}.done'
+
+
+def read_jsonl(file_path: str) -> Iterator[dict[str, Any]]:
+    """Read the complete records of a JSONL file, ignoring a trailing partially written line."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.endswith('\n') and line.strip():
+                yield loads(line)
+
+
+def export_json(jsonl_path: str, json_path: str) -> int:
+    """Write the records of a JSONL file as the pretty JSON array the rest of the pipeline reads."""
+    articles: list[dict[str, Any]] = list(read_jsonl(jsonl_path))
+    with open(json_path, 'w', encoding='utf-8') as f:
+        dump(articles, f, ensure_ascii=False, indent=4)
+    logger.info(f'Exported {len(articles)} articles to {json_path}')
+    return len(articles)
+
+
+async def follow_jsonl(file_path: str, poll_interval: float = consts.SINK_POLL_INTERVAL) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield records from a JSONL file that may still be being written, waiting for new lines until
+    the writer's `.done` marker appears and the end of the file is reached.
+    """
+    while not path.exists(file_path):
+        await sleep(poll_interval)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        pending: str = ''
+        while True:
+            # Checked before reading: once the marker exists everything has been flushed, so EOF is final.
+            finished: bool = path.exists(done_marker(file_path))
+            if line := f.readline():
+                pending += line
+                if pending.endswith('\n'):
+                    if pending.strip():
+                        yield loads(pending)
+                    pending = ''
+                continue
+            if finished:
+                return
+            await sleep(poll_interval)
@@ -1,4 +1,17 @@
-from typing import Final
+from typing import Any, Final
 
 URL: Final[str] = 'https://hromadske.ua/news'
 OUTPUT_FILE: Final[str] = 'hromadske_news.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://hromadske.ua/robots.txt',)
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://hromadske\.ua/[\w-]+/\d+-[\w-]+$'
+# The c-feed-item feed loads further items on scroll, so the listing page is rendered and scrolled.
+LISTING_SCROLLS: Final[int] = 5
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'time', 'class': 'c-post-header__date'},
+    'title': {'tag': 'h1', 'class': 'c-heading__title'},
+    'author': {'tag': 'a', 'class': 'c-post-author__name'},
+    'short_text': {'tag': 'p', 'class': 'text-start', 'count': 5},
+}
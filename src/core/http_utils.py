@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from httpx import Response
+
+
+def retry_after(response: Response) -> float | None:
+    """Seconds requested by a Retry-After header, given either as a number or an HTTP date."""
+    if not (value := response.headers.get('Retry-After')):
+        return
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return
@@ -1,6 +1,17 @@
-from typing import Final
+from typing import Any, Final
 
 URL: Final[str] = 'https://nashigroshi.org/topics/articles/'
-URL_PAGINATION: Final[str] = 'https://nashigroshi.org/topics/articles/page/{{page_num}}/'
+URL_PAGINATION: Final[str] = 'https://nashigroshi.org/topics/articles/page/{page_num}/'
 
 OUTPUT_FILE: Final[str] = 'nashi_groshi.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://nashigroshi.org/robots.txt',)
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://nashigroshi\.org/\d{4}/\d{2}/\d{2}/[^/]+/$'
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'span', 'class': 'meta', 'split': ('  //', 0), 'replace': (('\xa0', ''), ('\n', ''))},
+    'title': {'tag': 'h6', 'class': 'title', 'inner': 'strong', 'default': 'No Title'},
+    'author': {'tag': 'div', 'class': 'main-content', 'inner': 'p', 'pick': -1},
+    'short_text': {'tag': 'p', 'count': 3},
+}
@@ -1,26 +1,26 @@
-from json import dump
+from datetime import date
+from itertools import chain
+from typing import Iterator
 
-from httpx import AsyncClient
-from bs4 import BeautifulSoup, ResultSet, NavigableString, PageElement
+from bs4 import BeautifulSoup, ResultSet, NavigableString
 
 from loguru import logger
 
+from core.crawler.base import BaseCrawler
+from core.crawler.extractor import SelectorExtractor
 from core.nashi_groshi import consts
 
 
-class NashiGroshiData:
-    def __init__(self):
-        self.client: AsyncClient = AsyncClient()
-
-    async def fetch_links(self, url: str) -> str | None:
-        if not (response := await self.client.get(url)):
-            response.raise_for_status()
-            return
-        return response.text
+class NashiGroshiData(BaseCrawler):
+    extractor = SelectorExtractor(consts.ARTICLE_FIELDS)
+    parse_only = extractor.container_filter()
+    output_file = consts.OUTPUT_FILE
+    feeds = consts.FEEDS
+    article_link_pattern = consts.ARTICLE_LINK_PATTERN
 
     async def get_first_page_links(self, url: str) -> list[str] | None:
-        response: str = await self.fetch_links(url)
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
+        response: str = await self.fetch_listing(url)
+        soup: BeautifulSoup = self.make_soup(response)
         ul_blocks: ResultSet = soup.find_all('ul')
         return [link.get('href') for link in ul_blocks[1].find_all('a')] if len(ul_blocks) >= 2 else []
 
@@ -42,79 +42,48 @@ class NashiGroshiData:
 
     async def get_all_links(self) -> list[str] | None:
         base_url: str = consts.URL
-        if not (response := await self.fetch_links(base_url)):
+        if not (response := await self.fetch_listing(base_url)):
             logger.warning('Error retrieving the first page.')
             return
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
+        soup: BeautifulSoup = self.make_soup(response)
         last_page_number: int = await self.get_last_page_number(soup)
         if not (all_links := [
             link for page_num in range(2, last_page_number + 1) for link in
-            await self.get_first_page_links(consts.URL_PAGINATION.format(page_num))
+            await self.get_first_page_links(consts.URL_PAGINATION.format(page_num=page_num))
         ]):
             logger.warning('Check if all links are parserd correctly.')
             return
         return all_links
 
-    @staticmethod
-    async def parse_title(soup: BeautifulSoup) -> str | None:
-        title_tag: BeautifulSoup | None = soup.find('h6', class_='title')
-        if not (title := title_tag.find('strong').get_text(strip=True) if title_tag else 'No Title'):
-            logger.error(' Cannot parse title. Check it out.')
-            return
-        return title
-
-    @staticmethod
-    async def parse_date(soup: BeautifulSoup) -> str | None:
-        if not (date_tag := soup.find('span', class_='meta')):
-            logger.error('Cannot parsedate.')
-            return
-        date: str = date_tag.get_text(strip=True).split('  //')[0]
-        return date.replace('\xa0', '').replace('\n', '').strip()
-
-    @staticmethod
-    async def parse_author(soup: BeautifulSoup) -> str | None:
-        if not (main_content := soup.find('div', class_='main-content')):
-            return
-        last_p_tag: PageElement = main_content.find_all('p')[-1]
-        return last_p_tag.get_text(strip=True)
-
-    @staticmethod
-    async def parse_text(soup: BeautifulSoup) -> str | None:
-        if not (paragraphs := soup.find_all('p')):
-            return
-        return ' '.join([p.get_text(strip=True) for p in paragraphs[:3]]) if paragraphs else 'No Text'
-
-    async def extract_article_data(self, article_url: str) -> dict[str, str] | None:
-        if not (response := await self.fetch_links(url=article_url)):
-            logger.warning(f'Error fetching article {article_url}')
-            return
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
-        article_data = {
-            'date': await self.parse_date(soup=soup),
-            'link': article_url,
-            'title': await self.parse_title(soup=soup),
-            'author': await self.parse_author(soup=soup),
-            'short_text': await self.parse_text(soup=soup)
-        }
-
-        return article_data
-
-    async def sort_data(self):
-        all_links: list[str] | None = await self.get_all_links()
-        all_articles_data: list[dict[str, str]] = []
-
-        for link in all_links:
-            article_data: dict[str, str] | None = await self.extract_article_data(link)
-            if article_data:
-                all_articles_data.append(article_data)
-
-        logger.info(f'Collected data for {len(all_articles_data)} articles.')
-        logger.info(all_articles_data)
-
-        try:
-            with open(consts.OUTPUT_FILE, 'w', encoding='utf-8') as f:
-                dump(all_articles_data, f, ensure_ascii=False, indent=4)
-            logger.info(f"Data saved to {consts.OUTPUT_FILE}")
-        except Exception as e:
-            logger.error(f"Error saving data to JSON: {e}")
-        return all_articles_data
+    async def get_page_urls(self) -> Iterator[str]:
+        """Lazily yield every listing page URL, starting from the first page, which is fetched only once."""
+        if not (response := await self.fetch_listing(consts.URL)):
+            logger.warning('Error retrieving the first page.')
+            return iter(())
+        last_page_number: int = await self.get_last_page_number(self.make_soup(response))
+        self.prefetched[consts.URL] = response
+        return chain(
+            [consts.URL],
+            (consts.URL_PAGINATION.format(page_num=page_num) for page_num in range(2, last_page_number + 1))
+        )
+
+    async def sort_data(self, pipelined: bool = True, since: date | None = None):
+        """
+        Crawl the archive. With `since` (e.g. `self.last_run()`), pagination stops at the first
+        page holding only older or already harvested articles. Links come from the outlet's sitemaps
+        and feeds when they are readable, pagination is the fallback.
+        """
+        if (feed_links := await self.discover_from_feeds(since)) is not None:
+            all_articles_data: list[dict[str, str]] = await self.collect_articles(feed_links)
+        elif since:
+            all_articles_data = await self.collect_since(
+                await self.get_page_urls(), self.get_first_page_links, since
+            )
+        elif pipelined:
+            all_articles_data = await self.drain(
+                self.stream_articles(await self.get_page_urls(), self.get_first_page_links)
+            )
+        else:
+            all_links: list[str] | None = await self.get_all_links()
+            all_articles_data = await self.collect_articles(all_links)
+        return self.finish(all_articles_data)
@@ -1,6 +1,17 @@
-from typing import Final
+from typing import Any, Final
 
 URL: Final[str] = 'https://antac.org.ua/news/'
-URL_PAGINATION: Final[str] = 'https://antac.org.ua/news/page/{{page_num}}/'
+URL_PAGINATION: Final[str] = 'https://antac.org.ua/news/page/{page_num}/'
 
 SAVE_FILE: Final[str] = 'antac_news_data.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://antac.org.ua/robots.txt', 'https://antac.org.ua/feed/')
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://antac\.org\.ua/news/[^/]+/$'
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'time', 'class': 'single-post-heading__date'},
+    'title': {'tag': 'h1', 'class': 'heading-section__title'},
+    'author': {'tag': 'span', 'class': 'author'},
+    'short_text': {'tag': 'p', 'count': 3},
+}
@@ -1,29 +1,28 @@
-import json
-from typing import Any
+from datetime import date
+from itertools import chain
+from typing import Any, Iterator
 
-from httpx import AsyncClient
 from bs4 import BeautifulSoup, ResultSet, NavigableString
 
 from loguru import logger
 
+from core.crawler.base import BaseCrawler
+from core.crawler.extractor import SelectorExtractor
 from core.prot_corruption_shabunin import consts
 
 
-class AntacNewsData:
-    def __init__(self):
-        self.client: AsyncClient = AsyncClient()
-
-    async def fetch_links(self, url: str) -> list[str] | None:
-        if not (response := await self.client.get(url)):
-            response.raise_for_status()
-            return
-        return response.text
+class AntacNewsData(BaseCrawler):
+    extractor = SelectorExtractor(consts.ARTICLE_FIELDS)
+    parse_only = extractor.container_filter()
+    output_file = consts.SAVE_FILE
+    feeds = consts.FEEDS
+    article_link_pattern = consts.ARTICLE_LINK_PATTERN
 
     async def get_first_page_links(self, url: str) -> list[str] | None:
-        if not (response := await self.fetch_links(url)):
+        if not (response := await self.fetch_listing(url)):
             logger.error('Cannot parse a link.')
             return
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
+        soup: BeautifulSoup = self.make_soup(response)
         article_links: list[str] = []
         article_items: ResultSet = soup.find_all('article')
         for article in article_items:
@@ -50,69 +49,47 @@ class AntacNewsData:
             return 1
 
     async def get_all_links(self) -> list[list[str]] | None:
-        if not (response := await self.fetch_links(consts.URL)):
+        if not (response := await self.fetch_listing(consts.URL)):
             logger.warning("Error retrieving the first page.")
             return
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
+        soup: BeautifulSoup = self.make_soup(response)
         last_page_number: int = await self.get_last_page_number(soup)
         return [
             await self.get_first_page_links(consts.URL_PAGINATION.format(page_num=page_num))
             for page_num in range(1, last_page_number + 1)
         ]
 
-    @staticmethod
-    async def extract_title(soup: BeautifulSoup) -> str | None:
-        if not (title_tag := soup.find('h1', class_='heading-section__title')):
-            return
-        return title_tag.get_text(strip=True) if title_tag else 'No Title'
-
-    @staticmethod
-    async def extract_date(soup: BeautifulSoup) -> str | None:
-        date_tag: BeautifulSoup = soup.find('time', class_='single-post-heading__date')
-        if date_tag:
-            return date_tag.get_text(strip=True) if date_tag else 'No Date'
-
-    @staticmethod
-    async def extract_text(soup: BeautifulSoup) -> str | None:
-        paragraphs = soup.find_all('p')
-        if paragraphs:
-            return ' '.join([p.get_text(strip=True) for p in paragraphs[:3]]) if paragraphs else 'No Text'
-
-    @staticmethod
-    async def extract_author(soup: BeautifulSoup) -> str | None:
-        author_tag: BeautifulSoup = soup.find('span', class_='author')
-        if author_tag:
-            return author_tag.get_text(strip=True) if author_tag else 'No Author'
-
-    async def extract_article_data(self, article_url: list[str]) -> dict | None:
-        if not (response := await self.fetch_links(article_url)):
-            logger.warning(f'Error fetching article {article_url}')
-            return
-        soup: BeautifulSoup = BeautifulSoup(response, 'html.parser')
-        return {
-            'date': await self.extract_date(soup=soup),
-            'link': article_url,
-            'title': await self.extract_title(soup=soup),
-            'author': await self.extract_author(soup=soup),
-            'short_text': await self.extract_text(soup=soup)
-        }
-
-    @staticmethod
-    async def save_to_json(data: list) -> None:
-        try:
-            with open(consts.SAVE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
-            logger.info(f'Data successfully saved to {consts.SAVE_FILE}')
-        except Exception as e:
-            logger.error(f'Error saving data to JSON file: {e}')
-
-    async def sort_data(self):
-        all_links: list[list[str]] = await self.get_all_links()
-        all_articles_data: list[dict[str, str]] = []
-        for link in all_links:
-            article_data = await self.extract_article_data(link)
-            if article_data:
-                all_articles_data.append(article_data)
-        logger.info(f'Collected data for {len(all_articles_data)} articles.')
-        await self.save_to_json(all_articles_data)
-        return all_articles_data
+    async def get_page_urls(self) -> Iterator[str]:
+        """Lazily yield every listing page URL, starting from the first page, which is fetched only once."""
+        if not (response := await self.fetch_listing(consts.URL)):
+            logger.warning("Error retrieving the first page.")
+            return iter(())
+        last_page_number: int = await self.get_last_page_number(self.make_soup(response))
+        self.prefetched[consts.URL] = response
+        return chain(
+            [consts.URL],
+            (consts.URL_PAGINATION.format(page_num=page_num) for page_num in range(2, last_page_number + 1))
+        )
+
+    async def sort_data(self, pipelined: bool = True, since: date | None = None):
+        """
+        Crawl the archive. With `since` (e.g. `self.last_run()`), pagination stops at the first
+        page holding only older or already harvested articles. Links come from the outlet's sitemaps
+        and feeds when they are readable, pagination is the fallback.
+        """
+        if (feed_links := await self.discover_from_feeds(since)) is not None:
+            all_articles_data: list[dict[str, str]] = await self.collect_articles(feed_links)
+        elif since:
+            all_articles_data = await self.collect_since(
+                await self.get_page_urls(), self.get_first_page_links, since
+            )
+        elif pipelined:
+            all_articles_data = await self.drain(
+                self.stream_articles(await self.get_page_urls(), self.get_first_page_links)
+            )
+        else:
+            all_links: list[list[str]] = await self.get_all_links()
+            all_articles_data = await self.collect_articles(
+                [link for page_links in all_links if page_links for link in page_links]
+            )
+        return self.finish(all_articles_data)
@@ -1,5 +1,17 @@
-from typing import Final
+from typing import Any, Final
 
 URL: Final[str] = 'https://www.radiosvoboda.org/z/17391'
-PAGANATION_URL: Final[str] = 'https://www.radiosvoboda.org{{href}}'
+# Listing links are site-relative; `href` is filled in with str.format, so the braces must stay single.
+PAGANATION_URL: Final[str] = 'https://www.radiosvoboda.org{href}'
 SAVE_FILE: Final[str] = 'radiosvoboda_articles.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://www.radiosvoboda.org/robots.txt',)
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://www\.radiosvoboda\.org/a/skhemy-[^/]+/\d+\.html$'
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'div', 'class': 'published', 'inner': 'time', 'replace': (('\xa0', ''), ('\n', ''))},
+    'title': {'tag': 'title'},
+    'author': {'tag': 'a', 'class': 'links__item-link'},
+    'short_text': {'tag': 'p', 'count': 5},
+}
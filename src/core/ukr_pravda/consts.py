@@ -1,5 +1,16 @@
-from typing import Final
+from typing import Any, Final
 
 BASE_URL: Final[str] = 'https://www.pravda.com.ua/news/date_{{date}}/'
 
 SAVE_FILE: Final[str] = 'ukr_pravda_data_22_02.json'
+# Link discovery sources (robots.txt entries expand to their sitemaps) and the article links to keep.
+FEEDS: Final[tuple[str, ...]] = ('https://www.pravda.com.ua/rss/view_news/',)
+ARTICLE_LINK_PATTERN: Final[str] = r'^https://www\.pravda\.com\.ua/news/\d{4}/\d{2}/\d{1,2}/\d+/$'
+
+# Article selector spec, see core.crawler.extractor.FieldSelector for the supported keys.
+ARTICLE_FIELDS: Final[dict[str, dict[str, Any]]] = {
+    'date': {'tag': 'div', 'class': 'post_time', 'split': ('—', -1), 'default': 'Unknown Date'},
+    'title': {'tag': 'h1', 'default': 'No Title'},
+    'author': {'tag': 'span', 'class': 'post_author', 'replace': ((' —', ''),), 'default': 'Unknown Author'},
+    'short_text': {'tag': 'div', 'class': 'post_text', 'default': 'No Short Text'},
+}
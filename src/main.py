@@ -1,5 +1,20 @@
+from argparse import ArgumentParser
 from asyncio import run
+from datetime import date
+from os import path
+from typing import Awaitable
 
+from loguru import logger
+
+from core.crawler import consts as crawler_consts
+from core.crawler.archive import index_path
+from core.crawler.base import BaseCrawler
+from core.crawler.client import close_shared_client
+from core.crawler.crawl_index import close_shared_crawl_index
+from core.crawler.orchestrator import CrawlOrchestrator
+from core.crawler.parse_pool import shutdown_parse_pool
+from core.crawler.rendering import close_shared_render_pool
+from core.hromadske.hromadske_crawler import HromadskeData
 from core.nashi_groshi.nashi_groshi_crawler import NashiGroshiData
 from core.prot_corruption_shabunin.prompt_corup_crawler import AntacNewsData
 from core.bihus_info.bihus_crawler import BihusData, consts
@@ -8,6 +23,70 @@ from core.shemy_radio_svoboda.shemy_crawler import RadioSvobodaData
 
 from core.ai.prompts import DataCategorizer
 
+OUTLETS: dict[str, type[BaseCrawler]] = {
+    'bihus': BihusData,
+    'hromadske': HromadskeData,
+    'nashi_groshi': NashiGroshiData,
+    'antac': AntacNewsData,
+    'radio_svoboda': RadioSvobodaData,
+    'ukr_pravda': UkrPravdaData,
+}
+
+
+async def closing_shared(entry_point: Awaitable):
+    """Run an entry point, then close the process-wide client, render pool and crawl index crawlers fell back to."""
+    try:
+        return await entry_point
+    finally:
+        await close_shared_client()
+        await close_shared_render_pool()
+        close_shared_crawl_index()
+
+
+async def crawl(
+        outlets: list[str],
+        concurrency: int,
+        bandwidth: float | None,
+        jsonl: bool,
+        since: date | None,
+        since_last_run: bool
+):
+    """Refresh any subset of the outlets concurrently under one shared budget."""
+    return await CrawlOrchestrator(
+        [OUTLETS[outlet] for outlet in outlets or OUTLETS],
+        concurrency=concurrency,
+        bandwidth=bandwidth,
+        sinks=jsonl,
+        since=since,
+        since_last_run=since_last_run
+    ).run()
+
+
+async def reextract(outlets: list[str]):
+    """Rebuild the outlets' datasets from their page archives with the current selectors, no network."""
+    for outlet in outlets or OUTLETS:
+        crawler: BaseCrawler = OUTLETS[outlet](incremental=False, archive_pages=False)
+        if not path.exists(index_path(crawler.archive_path())):
+            logger.warning(f'No page archive for {outlet}, skipping.')
+            continue
+        crawler.save_to_json(crawler.output_file, await crawler.reextract(), merge=True)
+    shutdown_parse_pool()
+
+
+async def batch(arguments):
+    """One step of a batch-job run: build the requests file, submit it, download the results or ingest them."""
+    categorizer = DataCategorizer()
+    if arguments.action == 'build':
+        await categorizer.build_batch(arguments.input, arguments.batch_file)
+    elif arguments.action == 'submit':
+        await categorizer.submit_batch(arguments.batch_file)
+    elif arguments.action == 'download':
+        await categorizer.download_batch(arguments.batch_id, arguments.results_file)
+    else:
+        await categorizer.ingest_batch(
+            arguments.results_file, arguments.input, arguments.output_json, arguments.output_docx
+        )
+
 
 async def main():
     # return await BihusData().sort_data()
@@ -18,4 +97,56 @@ async def main():
     )
 
 if __name__ == '__main__':
-    run(main())
+    parser = ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command')
+    crawl_parser = subparsers.add_parser('crawl', help='Crawl outlets concurrently (all of them by default).')
+    crawl_parser.add_argument('outlets', nargs='*', metavar='OUTLET', help=f'Any of: {", ".join(OUTLETS)}.')
+    crawl_parser.add_argument('--concurrency', type=int, default=crawler_consts.ORCHESTRATOR_CONCURRENCY)
+    crawl_parser.add_argument('--bandwidth', type=float, default=None, help='Bytes per second for all outlets.')
+    crawl_parser.add_argument(
+        '--jsonl', action='store_true', help='Stream articles to a fresh .jsonl file per outlet as they are extracted.'
+    )
+    crawl_parser.add_argument(
+        '--since', type=date.fromisoformat, default=None,
+        help='Skip articles published before this date (YYYY-MM-DD).'
+    )
+    crawl_parser.add_argument(
+        '--since-last-run', action='store_true', help='Skip articles published before each outlet\'s last successful run.'
+    )
+    reextract_parser = subparsers.add_parser(
+        'reextract', help='Rebuild datasets from the page archives (all outlets by default).'
+    )
+    reextract_parser.add_argument('outlets', nargs='*', metavar='OUTLET', help=f'Any of: {", ".join(OUTLETS)}.')
+    batch_parser = subparsers.add_parser('batch', help='Categorize an articles file through a provider batch job.')
+    batch_actions = batch_parser.add_subparsers(dest='action', required=True)
+    build_parser = batch_actions.add_parser('build', help='Write the batch-job requests for an articles file.')
+    build_parser.add_argument('input')
+    build_parser.add_argument('batch_file')
+    submit_parser = batch_actions.add_parser('submit', help='Upload a requests file and start the job.')
+    submit_parser.add_argument('batch_file')
+    download_parser = batch_actions.add_parser('download', help='Wait for a job and save its results.')
+    download_parser.add_argument('batch_id')
+    download_parser.add_argument('results_file')
+    ingest_parser = batch_actions.add_parser('ingest', help='Write the JSON and DOCX outputs from job results.')
+    ingest_parser.add_argument('results_file')
+    ingest_parser.add_argument('input')
+    ingest_parser.add_argument('output_json')
+    ingest_parser.add_argument('output_docx')
+    arguments = parser.parse_args()
+
+    if arguments.command in ('crawl', 'reextract'):
+        if unknown := set(arguments.outlets) - OUTLETS.keys():
+            parser.error(f'Unknown outlets: {", ".join(sorted(unknown))}')
+    if arguments.command == 'crawl':
+        run(closing_shared(
+            crawl(
+                arguments.outlets, arguments.concurrency, arguments.bandwidth, arguments.jsonl, arguments.since,
+                arguments.since_last_run
+            )
+        ))
+    elif arguments.command == 'reextract':
+        run(closing_shared(reextract(arguments.outlets)))
+    elif arguments.command == 'batch':
+        run(closing_shared(batch(arguments)))
+    else:
+        run(closing_shared(main()))